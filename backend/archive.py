@@ -0,0 +1,102 @@
+"""
+Local archive of raw filing documents.
+Documents are gzip-compressed and stored by the sha256 of their content
+(objects/ab/abcdef....gz), so identical documents are kept once. The
+archived_filings table maps each accession number to its content hash.
+backend.reparse_archive re-runs the parser over the archive without any
+network access.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .config import FILING_ARCHIVE_DIR
+from .models import ArchivedFiling
+
+COPY_CHUNK_SIZE = 1024 * 1024
+# Level 6 is gzip's default; level 9 is several times slower for ~1% smaller XML
+COMPRESS_LEVEL = 6
+
+
+class FilingArchive:
+    def __init__(self, root: str = FILING_ARCHIVE_DIR):
+        self.root = Path(root)
+
+    def blob_path(self, content_hash: str) -> Path:
+        return self.root / "objects" / content_hash[:2] / f"{content_hash}.gz"
+
+    def put_file(self, path) -> Tuple[str, int]:
+        """
+        Compresses the file at `path` into the archive in one streaming pass.
+        Returns (content hash, uncompressed size). Already archived content is not rewritten.
+        """
+        objects_dir = self.root / "objects"
+        objects_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        # The hash is only known once the content has been read, so compress
+        # into a temporary file and move it into place afterwards.
+        fd, tmp_name = tempfile.mkstemp(dir=objects_dir, suffix=".part")
+        try:
+            with open(path, "rb") as src, os.fdopen(fd, "wb") as raw, \
+                    gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=COMPRESS_LEVEL, mtime=0) as dst:
+                while True:
+                    chunk = src.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    dst.write(chunk)
+
+            content_hash = digest.hexdigest()
+            target = self.blob_path(content_hash)
+            if target.exists():
+                os.unlink(tmp_name)
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_name, target)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+        return content_hash, size
+
+    def read(self, content_hash: str) -> bytes:
+        with gzip.open(self.blob_path(content_hash), "rb") as f:
+            return f.read()
+
+    def extract(self, content_hash: str, path):
+        """Decompresses an archived document to `path`."""
+        with gzip.open(self.blob_path(content_hash), "rb") as src, open(path, "wb") as dst:
+            shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+
+
+def record_archived_filing(
+    db: Session,
+    *,
+    accession_number: str,
+    cik: str,
+    form_type: Optional[str],
+    filing_date: Optional[date],
+    content_hash: str,
+    size: int,
+):
+    """Adds or updates the archive index row in the caller's transaction."""
+    db.merge(
+        ArchivedFiling(
+            accession_number=accession_number,
+            cik=cik,
+            form_type=form_type,
+            filing_date=filing_date,
+            content_hash=content_hash,
+            size=size,
+            archived_at=datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0),
+        )
+    )
@@ -0,0 +1,189 @@
+"""
+Concurrency benchmark for the storage layer.
+Measures `GET /companies`-style read latency while an ingestion writer and an
+enrichment writer hit the same database, for each SQLite journal mode
+(or against a scratch server database passed with --url).
+
+Usage:
+    python -m backend.benchmark_concurrency --seconds 10 --readers 8
+"""
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from .models import Base, Company
+from .storage import create_storage_engine, is_sqlite
+
+
+def seed(Session, rows: int):
+    db = Session()
+    try:
+        today = date.today()
+        db.add_all([
+            Company(
+                cik=f"seed{i:07d}",
+                name=f"Seed Company {i}",
+                city="San Francisco",
+                state="CA",
+                industry="Technology" if i % 3 else "Healthcare",
+                founded_year=str(2015 + i % 10),
+                latest_filing_date=today - timedelta(days=i % 365),
+                revenue_range="$1 - $1,000,000",
+                design_opportunity=json.dumps({"phase": "Growth", "needs": ["Design System"], "priority": "Medium"}),
+                enrichment_status="pending",
+            )
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def ingestion_writer(Session, stop: threading.Event, batch_size: int, stats: dict):
+    """Mimics ingest_filings: many inserts committed in one transaction."""
+    n = 0
+    while not stop.is_set():
+        db = Session()
+        try:
+            for _ in range(batch_size):
+                db.add(Company(
+                    cik=f"ingest{threading.get_ident()}-{n}",
+                    name=f"Ingested Company {n}",
+                    industry="Technology",
+                    latest_filing_date=date.today(),
+                    maturity_info=json.dumps({"age": 1, "stage": "Early-Stage", "is_early_stage": True}),
+                ))
+                n += 1
+            db.commit()
+            stats["ingest_commits"] += 1
+        except Exception:
+            db.rollback()
+            stats["write_errors"] += 1
+        finally:
+            db.close()
+
+
+def enrichment_writer(Session, stop: threading.Event, stats: dict):
+    """Mimics enrich_company_profile: small per-row update commits."""
+    i = 0
+    while not stop.is_set():
+        db = Session()
+        try:
+            company = db.query(Company).filter(Company.cik == f"seed{i % 1000:07d}").first()
+            if company:
+                company.enrichment_status = "processing"
+                db.commit()
+                company.enrichment_status = "completed"
+                company.engagement_recommendation = f"Recommendation {i}"
+                db.commit()
+                stats["enrich_commits"] += 2
+        except Exception:
+            db.rollback()
+            stats["write_errors"] += 1
+        finally:
+            db.close()
+        i += 1
+
+
+def reader(Session, stop: threading.Event, latencies: list, stats: dict):
+    """Mimics get_companies with the default dashboard filters."""
+    threshold = date.today() - timedelta(days=90)
+    while not stop.is_set():
+        db = Session()
+        start = time.perf_counter()
+        try:
+            rows = (
+                db.query(Company)
+                .filter(Company.latest_filing_date >= threshold)
+                .order_by(Company.latest_filing_date.desc())
+                .limit(100)
+                .all()
+            )
+            len(rows)
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            stats["read_errors"] += 1
+        finally:
+            db.close()
+
+
+def run_scenario(url: str, journal_mode: str, seconds: float, readers: int, batch_size: int, seed_rows: int) -> dict:
+    engine = create_storage_engine(url, journal_mode=journal_mode)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    seed(Session, seed_rows)
+
+    stop = threading.Event()
+    latencies: list = []
+    stats = {"ingest_commits": 0, "enrich_commits": 0, "write_errors": 0, "read_errors": 0}
+
+    threads = [
+        threading.Thread(target=ingestion_writer, args=(Session, stop, batch_size, stats)),
+        threading.Thread(target=enrichment_writer, args=(Session, stop, stats)),
+    ]
+    threads += [
+        threading.Thread(target=reader, args=(Session, stop, latencies, stats))
+        for _ in range(readers)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+    result = {"mode": journal_mode if is_sqlite(url) else engine.dialect.name, "reads": len(latencies), **stats}
+    if latencies:
+        ordered = sorted(latencies)
+        result.update({
+            "p50_ms": statistics.median(ordered) * 1000,
+            "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+            "p99_ms": ordered[int(len(ordered) * 0.99) - 1] * 1000,
+            "max_ms": ordered[-1] * 1000,
+        })
+    return result
+
+
+def print_result(result: dict):
+    print(
+        f"{result['mode']:>8} | reads {result['reads']:>7} | "
+        f"p50 {result.get('p50_ms', 0):8.2f}ms | p95 {result.get('p95_ms', 0):8.2f}ms | "
+        f"p99 {result.get('p99_ms', 0):8.2f}ms | max {result.get('max_ms', 0):8.2f}ms | "
+        f"ingest commits {result['ingest_commits']:>5} | enrich commits {result['enrich_commits']:>6} | "
+        f"read errors {result['read_errors']} | write errors {result['write_errors']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per ingestion commit")
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    parser.add_argument("--url", default=None, help="Scratch server database URL to benchmark; its tables are dropped (default: temporary SQLite file)")
+    args = parser.parse_args()
+
+    if args.url:
+        print_result(run_scenario(args.url, "WAL", args.seconds, args.readers, args.batch_size, args.seed_rows))
+        return
+
+    # Never benchmark against the live database: the scenario drops its tables.
+    with tempfile.TemporaryDirectory() as tmp:
+        for journal_mode in ("DELETE", "WAL"):
+            url = f"sqlite:///{os.path.join(tmp, f'bench_{journal_mode.lower()}.db')}"
+            print_result(run_scenario(url, journal_mode, args.seconds, args.readers, args.batch_size, args.seed_rows))
+
+
+if __name__ == "__main__":
+    main()
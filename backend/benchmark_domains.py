@@ -0,0 +1,81 @@
+"""
+Benchmark for search-result domain classification (backend.domains).
+Grows the blocklist with synthetic domains and times, for the same result
+hosts, the substring scan ingestion used before (`any(b in domain ...)`)
+against the compiled classifier, and counts the hosts the two disagree on
+(substring false positives such as "bigg2.com" for "g2.com").
+
+Usage:
+    python -m backend.benchmark_domains
+    python -m backend.benchmark_domains --sizes 100 1000 10000 --hosts 20000
+"""
+import argparse
+import random
+import time
+
+from .config import ATS_DOMAINS, URL_BLOCKLIST
+from .domains import BLOCKED, DomainClassifier
+
+TLDS = ("com", "io", "co", "net", "org", "ai", "co.uk", "com.br")
+
+
+def synthetic_domains(count: int, rng: random.Random) -> list:
+    return [f"directory{i}-{rng.randrange(10**6)}.{rng.choice(TLDS)}" for i in range(count)]
+
+
+def result_hosts(count: int, blocklist: list, rng: random.Random) -> list:
+    """Mostly company sites, some listed domains and subdomains, some look-alikes."""
+    hosts = []
+    for i in range(count):
+        roll = rng.random()
+        listed = rng.choice(blocklist)
+        if roll < 0.6:
+            hosts.append(f"acme{i}.{rng.choice(TLDS)}")
+        elif roll < 0.8:
+            hosts.append(listed)
+        elif roll < 0.9:
+            hosts.append(f"news.{listed}")
+        else:
+            # Contains a listed domain without being under it
+            hosts.append(f"big{listed}")
+    return hosts
+
+
+def substring_scan(hosts: list, blocklist: list) -> list:
+    return [any(b in host for b in blocklist) for host in hosts]
+
+
+def compiled(hosts: list, classifier: DomainClassifier) -> list:
+    return [classifier.classify(host) == BLOCKED for host in hosts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[len(URL_BLOCKLIST), 1000, 10000])
+    parser.add_argument("--hosts", type=int, default=10000, help="Search result hosts classified per size")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'entries':>8} {'substring scan':>15} {'compiled':>10} {'build':>8} {'disagree':>9}")
+    for size in args.sizes:
+        blocklist = list(URL_BLOCKLIST) + synthetic_domains(max(0, size - len(URL_BLOCKLIST)), rng)
+        hosts = result_hosts(args.hosts, blocklist, rng)
+
+        start = time.perf_counter()
+        classifier = DomainClassifier(blocklist, ATS_DOMAINS)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = substring_scan(hosts, blocklist)
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = compiled(hosts, classifier)
+        lookup = time.perf_counter() - start
+
+        disagree = sum(a != b for a, b in zip(expected, actual))
+        print(f"{len(blocklist):>8} {scan:>14.3f}s {lookup:>9.3f}s {build:>7.3f}s {disagree:>9}")
+
+
+if __name__ == "__main__":
+    main()
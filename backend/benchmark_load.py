@@ -0,0 +1,157 @@
+"""
+Load test: sync (threadpool) vs async handlers under a single uvicorn worker.
+Long-running ingestion calls are fired first, then a burst of concurrent
+`GET /companies`-style list requests. Sync handlers share the threadpool with
+the blocked ingestion threads; async handlers run on the event loop and the
+ingestion work gets its own thread limiter, as in backend.main.
+
+Usage:
+    python -m backend.benchmark_load --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+import httpx
+import uvicorn
+from anyio import CapacityLimiter, to_thread
+from fastapi import FastAPI, Response
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from .benchmark_concurrency import seed
+from .models import Base, Company
+from .schemas import serialize_companies
+from .storage import create_storage_engine, create_async_storage_engine
+
+
+def build_app(url: str, ingest_seconds: float, ingest_slots: int) -> FastAPI:
+    engine = create_storage_engine(url)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    async_engine = create_async_storage_engine(url)
+    AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    ingest_limiter = CapacityLimiter(ingest_slots)
+
+    app = FastAPI()
+
+    def list_statement():
+        return select(Company).order_by(Company.latest_filing_date.desc()).limit(100)
+
+    @app.get("/sync/companies")
+    def sync_companies():
+        db = Session()
+        try:
+            body = serialize_companies(db.scalars(list_statement()).all())
+        finally:
+            db.close()
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/async/companies")
+    async def async_companies():
+        async with AsyncSession() as db:
+            body = serialize_companies((await db.scalars(list_statement())).all())
+        return Response(content=body, media_type="application/json")
+
+    @app.post("/sync/ingest")
+    def sync_ingest():
+        time.sleep(ingest_seconds)
+        return {"ok": True}
+
+    @app.post("/async/ingest")
+    async def async_ingest():
+        await to_thread.run_sync(time.sleep, ingest_seconds, limiter=ingest_limiter)
+        return {"ok": True}
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_mode(base_url: str, mode: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + args.ingests)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        ingests = [
+            asyncio.create_task(client.post(f"/{mode}/ingest"))
+            for _ in range(args.ingests)
+        ]
+        await asyncio.sleep(0.2)  # let the ingestion calls occupy their threads
+
+        latencies = []
+        queue = asyncio.Queue()
+        for _ in range(args.requests):
+            queue.put_nowait(None)
+
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                resp = await client.get(f"/{mode}/companies")
+                resp.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        await asyncio.gather(*ingests)
+
+    ordered = sorted(latencies)
+    return {
+        "mode": mode,
+        "rps": len(ordered) / elapsed,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[int(len(ordered) * 0.95) - 1] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--ingests", type=int, default=40, help="Concurrent long-running ingestion calls (40 = default threadpool size)")
+    parser.add_argument("--ingest-seconds", type=float, default=3.0)
+    parser.add_argument("--seed-rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench_load.db')}"
+        setup_engine = create_storage_engine(url)
+        Base.metadata.create_all(bind=setup_engine)
+        seed(sessionmaker(bind=setup_engine), args.seed_rows)
+        setup_engine.dispose()
+
+        port = free_port()
+        config = uvicorn.Config(
+            build_app(url, args.ingest_seconds, args.ingests),
+            host="127.0.0.1", port=port, workers=1, log_level="warning",
+        )
+        server = uvicorn.Server(config)
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.05)
+
+        try:
+            for mode in ("sync", "async"):
+                r = asyncio.run(run_mode(f"http://127.0.0.1:{port}", mode, args))
+                print(
+                    f"{r['mode']:>5} | {r['rps']:8.1f} req/s | p50 {r['p50_ms']:8.2f}ms | "
+                    f"p95 {r['p95_ms']:8.2f}ms | max {r['max_ms']:8.2f}ms"
+                )
+        finally:
+            server.should_exit = True
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
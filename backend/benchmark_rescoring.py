@@ -0,0 +1,132 @@
+"""
+Benchmark for the nightly rescoring job (backend.rescoring).
+Seeds a scratch SQLite database with companies whose stored signals were
+computed as of their filing date, then times
+  - a per-row baseline (ORM objects, every rule evaluated for every row, no writes),
+  - the first rescoring pass (many rows drift and are written back),
+  - a second pass (nothing changed, read and compare only).
+
+Usage:
+    python -m backend.benchmark_rescoring --rows 100000
+    python -m backend.benchmark_rescoring --rows 1000000 --skip-baseline
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from .ingestion import (
+    analyze_funding,
+    analyze_hiring_signal,
+    analyze_maturity,
+    analyze_public_presence,
+    infer_design_opportunity,
+)
+from .models import Base, Company
+from .rescoring import rescore_companies
+from .storage import create_storage_engine
+
+SEED_CHUNK = 50_000
+INDUSTRIES = ("Technology", "Healthcare", "Biotechnology", "Other")
+REVENUES = ("$1 - $1,000,000", "Decline to Disclose", "$1,000,001 - $5,000,000")
+
+
+def seed(engine, rows: int):
+    """Signals as ingestion stored them, partly stale (hiring computed on the filing day)."""
+    today = date.today()
+    presence = json.dumps(analyze_public_presence(None))
+    with engine.begin() as conn:
+        for start in range(0, rows, SEED_CHUNK):
+            batch = []
+            for i in range(start, min(rows, start + SEED_CHUNK)):
+                founded_year = str(2014 + i % 12)
+                filing_date = today - timedelta(days=i % 400)
+                careers_url = f"https://company{i}.example.com/careers" if i % 4 == 0 else None
+                maturity = analyze_maturity(founded_year)
+                funding = analyze_funding({"industry": INDUSTRIES[i % 4], "revenue_range": REVENUES[i % 3]})
+                hiring = analyze_hiring_signal(careers_url, today)
+                inferred = infer_design_opportunity(maturity, funding, {}, json.loads(presence), hiring)
+                opportunity = inferred["design_opportunity"]
+                if i % 10 == 0:
+                    opportunity = {**opportunity, "ai_design_opportunities": [f"Redesign {i}"], "founder_insights": f"Insight {i}"}
+                batch.append({
+                    "cik": f"{i:010d}",
+                    "name": f"Company {i}",
+                    "industry": INDUSTRIES[i % 4],
+                    "founded_year": founded_year,
+                    "latest_filing_date": filing_date,
+                    "revenue_range": REVENUES[i % 3],
+                    "careers_url": careers_url,
+                    "maturity_info": json.dumps(maturity),
+                    "funding_details": json.dumps(funding),
+                    "public_presence_quality": presence,
+                    "hiring_signal": json.dumps(hiring),
+                    "design_opportunity": json.dumps(opportunity),
+                    "engagement_recommendation": inferred["engagement_recommendation"],
+                    "enrichment_status": "completed" if i % 10 == 0 else "pending",
+                })
+            conn.execute(insert(Company), batch)
+
+
+def per_row_baseline(Session) -> int:
+    """Loads full ORM rows and evaluates every rule for every company."""
+    db = Session()
+    changed = 0
+    try:
+        for company in db.scalars(select(Company).execution_options(yield_per=10_000)):
+            maturity = analyze_maturity(company.founded_year)
+            hiring = analyze_hiring_signal(company.careers_url, company.latest_filing_date)
+            inferred = infer_design_opportunity(
+                maturity,
+                json.loads(company.funding_details),
+                {},
+                json.loads(company.public_presence_quality),
+                hiring,
+            )
+            opportunity = {**json.loads(company.design_opportunity), **inferred["design_opportunity"]}
+            if (
+                maturity != json.loads(company.maturity_info)
+                or hiring != json.loads(company.hiring_signal)
+                or json.dumps(opportunity) != company.design_opportunity
+            ):
+                changed += 1
+    finally:
+        db.close()
+    return changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_storage_engine(f"sqlite:///{os.path.join(tmp, 'rescoring.db')}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        start = time.perf_counter()
+        seed(engine, args.rows)
+        print(f"Seeded {args.rows} companies in {time.perf_counter() - start:.1f}s")
+
+        if not args.skip_baseline:
+            start = time.perf_counter()
+            changed = per_row_baseline(Session)
+            print(f"per-row baseline (no writes): {time.perf_counter() - start:6.2f}s, {changed} rows would change")
+
+        for label in ("first pass", "second pass"):
+            start = time.perf_counter()
+            stats = rescore_companies(args.batch_size, session_factory=Session)
+            print(f"rescoring {label:<11}:   {time.perf_counter() - start:6.2f}s, {stats['updated']} of {stats['scanned']} rows updated")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Data versioning and HTTP caching for read endpoints.
+Ingestion and enrichment bump a version counter on every write; read endpoints
+turn it into strong ETags (304 on If-None-Match) and key an in-process result
+cache on it, so repeated loads cost a version lookup instead of a query.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import DataVersion
+
+DATA_VERSION_ID = 1
+RESULT_CACHE_MAX_ENTRIES = 256
+
+
+class VersionInfo(NamedTuple):
+    version: int
+    updated_at: datetime
+
+
+def _utcnow() -> datetime:
+    # Stored naive (UTC) so SQLite and PostgreSQL round-trip the same value
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def ensure_data_version(db: Session):
+    """Creates the counter row if missing. Called once at startup."""
+    if db.get(DataVersion, DATA_VERSION_ID) is None:
+        db.add(DataVersion(id=DATA_VERSION_ID, version=0, updated_at=_utcnow()))
+        db.commit()
+
+
+def bump_data_version(db: Session):
+    """
+    Increments the data version inside the caller's transaction,
+    so the bump becomes visible atomically with the data it describes.
+    """
+    now = _utcnow()
+    updated = (
+        db.query(DataVersion)
+        .filter(DataVersion.id == DATA_VERSION_ID)
+        .update(
+            {DataVersion.version: DataVersion.version + 1, DataVersion.updated_at: now},
+            synchronize_session=False,
+        )
+    )
+    if not updated:
+        db.add(DataVersion(id=DATA_VERSION_ID, version=1, updated_at=now))
+
+
+async def get_data_version(db: AsyncSession) -> VersionInfo:
+    result = await db.execute(
+        select(DataVersion.version, DataVersion.updated_at).where(DataVersion.id == DATA_VERSION_ID)
+    )
+    row = result.first()
+    if row is None:
+        return VersionInfo(0, datetime(1970, 1, 1))
+    return VersionInfo(row.version, row.updated_at)
+
+
+def cache_key(endpoint: str, **params) -> str:
+    """Normalized key: parameter order and unset (None/False/empty) values do not matter."""
+    normalized = {k: v for k, v in sorted(params.items()) if v not in (None, False, "")}
+    return f"{endpoint}?{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+def make_etag(version: VersionInfo, key: str) -> str:
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return f'"{version.version}-{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified_since(if_modified_since: str, updated_at: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return updated_at.replace(tzinfo=timezone.utc) <= since
+
+
+class ResultCache:
+    """
+    Small LRU of serialized responses for the current data version.
+    Any version change drops every entry, so stale results are never served.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._version = None
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, version: int) -> Optional[bytes]:
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: str, version: int, body: bytes):
+        with self._lock:
+            if version != self._version:
+                # A newer version was observed meanwhile; this body is already stale.
+                return
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+
+result_cache = ResultCache()
+
+
+async def cached_json_response(
+    request: Request,
+    db: AsyncSession,
+    key: str,
+    render: Callable[[], Awaitable[bytes]],
+    cache: Optional[ResultCache] = result_cache,
+) -> Response:
+    """
+    Serves `await render()` with validators derived from the data version.
+    Returns 304 when the client copy is current and reuses cached bodies otherwise.
+    """
+    version = await get_data_version(db)
+    etag = make_etag(version, key)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(version.updated_at.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get("if-modified-since") and _not_modified_since(
+        request.headers["if-modified-since"], version.updated_at
+    ):
+        return Response(status_code=304, headers=headers)
+
+    body = cache.get(key, version.version) if cache is not None else None
+    if body is None:
+        body = await render()
+        if cache is not None:
+            cache.put(key, version.version, body)
+
+    return Response(content=body, media_type="application/json", headers=headers)
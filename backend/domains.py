@@ -0,0 +1,186 @@
+"""
+Domain classification of search results: blocked sites (directories, news,
+social networks) and applicant tracking systems (ATS).
+List entries match on label boundaries, the domain itself and its subdomains:
+"g2.com" matches "g2.com" and "www.g2.com" but not "bigg2.com", and
+"lever.co" does not match "clever.com". Entries are compiled into one hash
+table, so classifying a host costs one lookup per label whatever the list sizes.
+
+Registrable domains ("example.co.uk" for "jobs.example.co.uk") follow the
+public suffix list: a built-in subset of common multi-label suffixes, or the
+full list from PUBLIC_SUFFIX_LIST_FILE (https://publicsuffix.org/list/).
+The lists extend with URL_BLOCKLIST_FILE / ATS_DOMAINS_FILE (one domain per
+line, # comments) and can be replaced while running with configure_domains()
+or re-read with reload_domain_lists().
+"""
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+from .config import ATS_DOMAINS, ATS_DOMAINS_FILE, PUBLIC_SUFFIX_LIST_FILE, URL_BLOCKLIST, URL_BLOCKLIST_FILE
+
+BLOCKED = "blocked"
+ATS = "ats"
+
+# Multi-label public suffixes seen in company search results; any other host's
+# last label is its public suffix. PUBLIC_SUFFIX_LIST_FILE replaces this set.
+DEFAULT_PUBLIC_SUFFIXES = (
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "me.uk",
+    "com.au", "net.au", "org.au", "co.nz", "org.nz", "co.za", "org.za",
+    "com.br", "net.br", "org.br", "com.mx", "com.ar", "com.co", "com.pe", "com.uy",
+    "co.jp", "ne.jp", "or.jp", "co.kr", "or.kr", "com.cn", "net.cn", "org.cn",
+    "com.hk", "com.tw", "com.sg", "com.my", "co.in", "net.in", "org.in", "co.id",
+    "co.il", "com.tr", "com.ua", "co.th", "com.ph", "com.vn", "com.pk", "com.ng",
+    "com.eg", "com.sa", "co.ke", "com.es", "com.pl", "co.at", "or.at",
+    "github.io", "herokuapp.com", "vercel.app", "netlify.app", "pages.dev",
+)
+
+
+def normalize_host(url_or_host: str) -> str:
+    """Lower-cased host without scheme, credentials, port, trailing dot or leading "www."."""
+    value = url_or_host.strip().lower()
+    host = urlparse(value).netloc if "://" in value else value.split("/", 1)[0]
+    host = host.rsplit("@", 1)[-1].split(":", 1)[0].rstrip(".")
+    return host[4:] if host.startswith("www.") else host
+
+
+def _suffixes(host: str):
+    """host, then each parent domain: a.b.com, b.com, com."""
+    yield host
+    dot = host.find(".")
+    while dot != -1:
+        yield host[dot + 1:]
+        dot = host.find(".", dot + 1)
+
+
+def read_domain_file(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+
+
+class PublicSuffixes:
+    """Public suffix rules in the publicsuffix.org format, including "*." and "!" rules."""
+
+    def __init__(self, rules: Iterable[str] = DEFAULT_PUBLIC_SUFFIXES):
+        self.rules = set()
+        self.wildcards = set()
+        self.exceptions = set()
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule or rule.startswith("//"):
+                continue
+            rule = rule.split()[0]
+            if rule.startswith("!"):
+                self.exceptions.add(rule[1:])
+            elif rule.startswith("*."):
+                self.wildcards.add(rule[2:])
+            else:
+                self.rules.add(rule)
+
+    @classmethod
+    def from_file(cls, path: str) -> "PublicSuffixes":
+        with open(path, encoding="utf-8") as f:
+            return cls(f)
+
+    def public_suffix(self, host: str) -> str:
+        for candidate in _suffixes(host):
+            if candidate in self.exceptions:
+                # "!city.kawasaki.jp": the suffix is the rule minus its first label
+                return candidate.split(".", 1)[1]
+            if candidate in self.rules:
+                return candidate
+            parent = candidate.split(".", 1)[1] if "." in candidate else None
+            if parent is not None and parent in self.wildcards:
+                return candidate
+        # Implicit "*" rule: the last label
+        return host.rsplit(".", 1)[-1]
+
+    def registrable_domain(self, host: str) -> Optional[str]:
+        """The public suffix plus one label, or None for a bare suffix."""
+        suffix = self.public_suffix(host)
+        if host == suffix:
+            return None
+        prefix = host[: -len(suffix) - 1]
+        return f"{prefix.rsplit('.', 1)[-1]}.{suffix}"
+
+
+class DomainClassifier:
+    def __init__(self, blocklist: Iterable[str], ats_domains: Iterable[str], suffixes: PublicSuffixes = None):
+        self.suffixes = suffixes or PublicSuffixes()
+        # domain -> category; ATS entries win over blocked ones listed for the same domain
+        self._categories: dict[str, str] = {}
+        for category, entries in ((BLOCKED, blocklist), (ATS, ats_domains)):
+            for entry in entries:
+                domain = normalize_host(entry)
+                if not domain:
+                    continue
+                if self.suffixes.registrable_domain(domain) is None:
+                    # A bare public suffix ("com", "co.uk") would match every host under it
+                    print(f"Ignoring {category} domain {entry!r}: it is a public suffix")
+                    continue
+                self._categories[domain] = category
+
+    def __len__(self):
+        return len(self._categories)
+
+    def classify(self, url_or_host: str) -> Optional[str]:
+        """BLOCKED, ATS or None, from the most specific listed domain containing the host."""
+        if not url_or_host:
+            return None
+        categories = self._categories
+        for candidate in _suffixes(normalize_host(url_or_host)):
+            category = categories.get(candidate)
+            if category is not None:
+                return category
+        return None
+
+    def registrable_domain(self, url_or_host: str) -> Optional[str]:
+        host = normalize_host(url_or_host)
+        return self.suffixes.registrable_domain(host) if host else None
+
+
+def in_domain(url_or_host: str, domain: str) -> bool:
+    """True for the domain itself and its subdomains."""
+    host = normalize_host(url_or_host)
+    return host == domain or host.endswith("." + domain)
+
+
+def load_classifier(blocklist: Iterable[str] = None, ats_domains: Iterable[str] = None) -> DomainClassifier:
+    """Classifier from the given lists, or from config plus the optional list files."""
+    if blocklist is None:
+        blocklist = list(URL_BLOCKLIST) + (read_domain_file(URL_BLOCKLIST_FILE) if URL_BLOCKLIST_FILE else [])
+    if ats_domains is None:
+        ats_domains = list(ATS_DOMAINS) + (read_domain_file(ATS_DOMAINS_FILE) if ATS_DOMAINS_FILE else [])
+    suffixes = PublicSuffixes.from_file(PUBLIC_SUFFIX_LIST_FILE) if PUBLIC_SUFFIX_LIST_FILE else PublicSuffixes()
+    return DomainClassifier(blocklist, ats_domains, suffixes)
+
+
+_classifier = load_classifier()
+
+
+def domain_classifier() -> DomainClassifier:
+    return _classifier
+
+
+def configure_domains(blocklist: Iterable[str] = None, ats_domains: Iterable[str] = None) -> DomainClassifier:
+    """Replaces the lists used by ingestion; omitted lists come from config."""
+    global _classifier
+    # Built first and swapped in one assignment, so concurrent lookups see either list
+    _classifier = load_classifier(blocklist, ats_domains)
+    return _classifier
+
+
+def reload_domain_lists() -> DomainClassifier:
+    """Re-reads URL_BLOCKLIST_FILE, ATS_DOMAINS_FILE and PUBLIC_SUFFIX_LIST_FILE."""
+    return configure_domains()
+
+
+def is_blocked(url_or_host: str) -> bool:
+    return _classifier.classify(url_or_host) == BLOCKED
+
+
+def is_ats(url_or_host: str) -> bool:
+    return _classifier.classify(url_or_host) == ATS
+
+
+def registrable_domain(url_or_host: str) -> Optional[str]:
+    return _classifier.registrable_domain(url_or_host)
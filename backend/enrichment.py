@@ -5,6 +5,8 @@ Provides async background enrichment of company profiles.
 import httpx
 import json
 from .models import SessionLocal, Company
+from .cache import bump_data_version
+from .metrics import QUEUE_DEPTH, record_request, stage, status_outcome
 from .config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, OPENROUTER_MODEL
 
 
@@ -84,12 +86,17 @@ def call_openrouter_api(prompt: str) -> dict:
     }
     
     try:
-        with httpx.Client(timeout=60.0) as client:
-            response = client.post(
-                f"{OPENROUTER_BASE_URL}/chat/completions",
-                headers=headers,
-                json=payload
-            )
+        with stage("openrouter_call"), httpx.Client(timeout=60.0) as client:
+            try:
+                response = client.post(
+                    f"{OPENROUTER_BASE_URL}/chat/completions",
+                    headers=headers,
+                    json=payload
+                )
+            except httpx.HTTPError:
+                record_request(OPENROUTER_BASE_URL, "error")
+                raise
+            record_request(OPENROUTER_BASE_URL, status_outcome(response.status_code))
             response.raise_for_status()
             
             data = response.json()
@@ -124,6 +131,7 @@ def enrich_company_profile(company_id: int):
         
         # Set status to processing
         company.enrichment_status = "processing"
+        bump_data_version(db)
         db.commit()
         
         # Build prompt and call AI
@@ -132,6 +140,7 @@ def enrich_company_profile(company_id: int):
         
         if "error" in ai_response:
             company.enrichment_status = "failed"
+            bump_data_version(db)
             db.commit()
             print(f"Enrichment failed for company {company_id}: {ai_response['error']}")
             return
@@ -156,7 +165,9 @@ def enrich_company_profile(company_id: int):
             company.engagement_recommendation = ai_response["engagement_strategy"]
         
         company.enrichment_status = "completed"
-        db.commit()
+        with stage("db_write"):
+            bump_data_version(db)
+            db.commit()
         
         print(f"Successfully enriched company {company_id}: {company.name}")
         
@@ -166,6 +177,7 @@ def enrich_company_profile(company_id: int):
             company = db.query(Company).filter(Company.id == company_id).first()
             if company:
                 company.enrichment_status = "failed"
+                bump_data_version(db)
                 db.commit()
         except:
             pass
@@ -192,7 +204,10 @@ def enrich_pending_companies():
     
     print(f"Starting enrichment for {len(company_ids)} companies...")
     
-    for company_id in company_ids:
+    pending = QUEUE_DEPTH.labels("enrichment_pending")
+    for position, company_id in enumerate(company_ids):
+        pending.set(len(company_ids) - position)
         enrich_company_profile(company_id)
+    pending.set(0)
     
     print(f"Completed enrichment batch of {len(company_ids)} companies")
@@ -0,0 +1,290 @@
+"""
+Entity resolution: groups the CIKs of one organisation into a cluster.
+Startups and their sponsors file under related entities ("Acme Ventures Fund
+II, LP", "Acme Ventures SPV I LLC", "ACME VENTURES, INC."), each with its own
+CIK. Every company's name is normalized once into a core name (legal suffixes,
+fund/SPV/series markers and numerals removed) and stored with a few blocking
+keys: the exact core, a token-prefix n-gram and a Soundex key. Cores without
+a distinctive word ("fund", "real estate income") get no keys and are never
+linked. A new company is compared only with the companies sharing one of its
+keys and joins the cluster it matches best (core names at least
+ENTITY_MATCH_THRESHOLD similar, in the same state when both are known). Other
+clusters it matches are merged in only when they also match that cluster, so
+one company cannot chain unrelated clusters together.
+The cost per company depends on its block sizes, not on the table size.
+
+Ingestion resolves each new company; this module's CLI backfills companies
+without a cluster (or rebuilds all clusters after a rule change).
+
+Usage:
+    python -m backend.entities
+    python -m backend.entities --rebuild
+"""
+import argparse
+import re
+import time
+import unicodedata
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from .cache import bump_data_version
+from .config import ENTITY_MATCH_THRESHOLD, ENTITY_MAX_BLOCK
+from .models import Base, Company, EntityKey, EntityMember, SessionLocal, engine
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "lllp", "llp", "lp", "corp", "corporation", "co", "company",
+    "ltd", "limited", "plc", "pllc", "pc", "pbc", "gmbh", "ag", "sa", "nv", "bv", "pte", "pty",
+}
+# Words that tell related vehicles of one organisation apart
+VEHICLE_MARKERS = {
+    "fund", "funds", "spv", "series", "vehicle", "feeder", "master", "parallel", "offshore",
+    "onshore", "holdings", "holding", "holdco", "gp", "lp", "llc", "a", "an", "of", "the",
+}
+# Finance words shared by unrelated sponsors; a core needs one other word to be linked
+GENERIC_WORDS = {
+    "and", "capital", "partners", "partner", "partnership", "ventures", "venture", "investment",
+    "investments", "investors", "equity", "private", "real", "estate", "property", "properties",
+    "income", "growth", "opportunity", "opportunities", "credit", "debt", "asset", "assets",
+    "management", "advisors", "advisers", "associates", "group", "global", "international",
+    "financial", "finance", "strategies", "strategic", "portfolio", "trust", "value", "select",
+}
+NUMERAL = re.compile(r"^(?:[ivx]+|\d+|\d+(?:st|nd|rd|th))$")
+# Names shorter than this are too ambiguous to link
+MIN_CORE_LENGTH = 3
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"), **dict.fromkeys("dt", "3"),
+    "l": "4", **dict.fromkeys("mn", "5"), "r": "6",
+}
+
+
+def _tokens(name: str) -> list:
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    ascii_name = re.sub(r"[.'`]", "", ascii_name).replace("&", " and ")
+    return re.sub(r"[^a-z0-9]+", " ", ascii_name).split()
+
+
+def normalize_name(name: str) -> str:
+    """Lower-cased ASCII name without punctuation, a leading "the" or trailing legal suffixes."""
+    tokens = _tokens(name or "")
+    if tokens and tokens[0] == "the" and len(tokens) > 1:
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def core_name(normalized: str) -> str:
+    """The normalized name without vehicle markers and numerals ("acme ventures fund ii" -> "acme ventures")."""
+    tokens = normalized.split()
+    core = tokens[:1] + [t for t in tokens[1:] if t not in VEHICLE_MARKERS and not NUMERAL.match(t)]
+    while len(core) > 1 and core[-1] in LEGAL_SUFFIXES:
+        core.pop()
+    return " ".join(core)
+
+
+def soundex(word: str) -> str:
+    if not word:
+        return ""
+    code = word[0]
+    last = SOUNDEX_CODES.get(word[0], "")
+    for char in word[1:]:
+        digit = SOUNDEX_CODES.get(char, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+
+def is_distinctive(core: str) -> bool:
+    """True if the core is long enough and has a word that is not a marker, numeral or generic finance word."""
+    return len(core) >= MIN_CORE_LENGTH and any(
+        t not in VEHICLE_MARKERS and t not in GENERIC_WORDS and t not in LEGAL_SUFFIXES and not NUMERAL.match(t)
+        for t in core.split()
+    )
+
+
+def blocking_keys(core: str) -> list:
+    """Keys of the blocks a core is compared in; none for cores too generic to link."""
+    if not is_distinctive(core):
+        return []
+    tokens = core.split()
+    second = tokens[1] if len(tokens) > 1 else ""
+    return [
+        f"n:{core}",
+        # Token-prefix n-gram: survives suffix variants ("acme robotic systems")
+        f"p:{tokens[0][:4]}{second[:4]}",
+        # Phonetic: survives spelling variants ("acmee robotix")
+        f"s:{soundex(tokens[0])}{soundex(second)}",
+    ]
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Dice coefficient of the character trigrams of two core names."""
+    if a == b:
+        return 1.0
+    grams_a, grams_b = _trigrams(a), _trigrams(b)
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+def _known(state: Optional[str]) -> bool:
+    return bool(state) and state != "Unknown"
+
+
+def _same_state(a: Optional[str], b: Optional[str]) -> bool:
+    return not (_known(a) and _known(b) and a != b)
+
+
+def _best_score(members: list, others: list) -> float:
+    """Highest similarity between two lists of (core name, state), pairs in different states excluded."""
+    return max(
+        (similarity(core, other) for core, state in members for other, other_state in others if _same_state(state, other_state)),
+        default=0.0,
+    )
+
+
+def _candidates(conn, keys: list) -> set:
+    candidates = set()
+    for key in keys:
+        block = conn.execute(
+            select(EntityKey.company_id).where(EntityKey.key == key).limit(ENTITY_MAX_BLOCK + 1)
+        ).scalars().all()
+        if len(block) <= ENTITY_MAX_BLOCK:
+            candidates.update(block)
+    return candidates
+
+
+def resolve_company(db: Session, company: Company) -> int:
+    """
+    Adds a company to the blocking index and to the cluster it matches best,
+    merging in the other matched clusters that also match that one. Flushes the session (the company needs its id); the caller commits.
+    Returns the company's cluster id.
+    """
+    db.flush()
+    # Plain Core statements on the session's connection: no ORM rows to build
+    conn = db.connection()
+    normalized = normalize_name(company.name)
+    core = core_name(normalized)
+    keys = blocking_keys(core)
+
+    # cluster id -> [(core name, state)] of its candidate members
+    members = {}
+    candidates = _candidates(conn, keys)
+    candidates.discard(company.id)
+    if candidates:
+        rows = conn.execute(
+            select(EntityMember.cluster_id, EntityMember.core_name, EntityMember.state)
+            .where(EntityMember.company_id.in_(candidates))
+        ).all()
+        for cluster_id, other_core, other_state in rows:
+            members.setdefault(cluster_id, []).append((other_core, other_state))
+
+    scores = {}
+    for cluster_id, cluster_members in members.items():
+        score = _best_score([(core, company.state)], cluster_members)
+        if score >= ENTITY_MATCH_THRESHOLD:
+            scores[cluster_id] = score
+    matched_clusters = set()
+    best_score = None
+    if scores:
+        target = max(scores, key=lambda c: (scores[c], -c))
+        best_score = scores[target]
+        # Other clusters the company matches join only if they match the target cluster too
+        matched_clusters = {target} | {
+            cluster_id for cluster_id in scores
+            if cluster_id != target and _best_score(members[cluster_id], members[target]) >= ENTITY_MATCH_THRESHOLD
+        }
+
+    cluster_id = min(matched_clusters | {company.id})
+    merged = matched_clusters - {cluster_id}
+    if merged:
+        conn.execute(update(EntityMember).where(EntityMember.cluster_id.in_(merged)).values(cluster_id=cluster_id))
+    conn.execute(
+        insert(EntityMember).values(
+            company_id=company.id,
+            cluster_id=cluster_id,
+            normalized_name=normalized,
+            core_name=core,
+            state=company.state,
+            match_score=best_score,
+        )
+    )
+    if keys:
+        conn.execute(insert(EntityKey), [{"key": key, "company_id": company.id} for key in keys])
+    return cluster_id
+
+
+def reresolve_company(db: Session, company: Company) -> int:
+    """
+    Re-links a company after its name changed: drops its keys and membership and
+    resolves it again. Clusters it used to bridge keep their other members, under
+    the lowest remaining id when the cluster was named after this company.
+    """
+    db.flush()
+    conn = db.connection()
+    conn.execute(delete(EntityKey).where(EntityKey.company_id == company.id))
+    conn.execute(delete(EntityMember).where(EntityMember.company_id == company.id))
+    lowest = conn.execute(
+        select(func.min(EntityMember.company_id)).where(EntityMember.cluster_id == company.id)
+    ).scalar()
+    if lowest is not None:
+        conn.execute(update(EntityMember).where(EntityMember.cluster_id == company.id).values(cluster_id=lowest))
+    return resolve_company(db, company)
+
+
+def resolve_unclustered(batch_size: int = 1000, rebuild: bool = False) -> dict:
+    """Resolves every company that has no cluster yet, in id order; with `rebuild`, all of them."""
+    db = SessionLocal()
+    stats = {"resolved": 0, "clusters": 0}
+    try:
+        if rebuild:
+            db.execute(delete(EntityKey))
+            db.execute(delete(EntityMember))
+            db.commit()
+        cursor = 0
+        while True:
+            companies = db.scalars(
+                select(Company)
+                .outerjoin(EntityMember, EntityMember.company_id == Company.id)
+                .where(EntityMember.company_id.is_(None), Company.id > cursor)
+                .order_by(Company.id)
+                .limit(batch_size)
+            ).all()
+            if not companies:
+                break
+            for company in companies:
+                resolve_company(db, company)
+            cursor = companies[-1].id
+            stats["resolved"] += len(companies)
+            bump_data_version(db)
+            db.commit()
+        stats["clusters"] = len(db.execute(select(EntityMember.cluster_id).distinct()).all())
+    finally:
+        db.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rebuild", action="store_true", help="Discard all clusters and resolve every company again")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Companies per commit")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    stats = resolve_unclustered(args.batch_size, args.rebuild)
+    print(f"Resolved {stats['resolved']} companies into {stats['clusters']} clusters in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
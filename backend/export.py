@@ -0,0 +1,210 @@
+"""
+Streaming bulk export of companies.
+Rows are read through a server-side cursor in fixed-size batches and encoded
+incrementally, so memory stays flat regardless of the size of the result.
+"""
+import csv
+import io
+import json
+from datetime import date
+from typing import AsyncIterator
+
+import orjson
+
+from .models import AsyncSessionLocal, Company
+from .schemas import SIGNAL_FIELDS, company_to_dict, decode_signal
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_COLUMNS = [column.name for column in Company.__table__.columns]
+
+
+def _csv_row(company: Company) -> dict:
+    row = {}
+    for name in EXPORT_COLUMNS:
+        value = getattr(company, name)
+        if isinstance(value, date):
+            value = value.isoformat()
+        row[name] = value
+    return row
+
+
+async def _iter_batches(stmt) -> AsyncIterator[list]:
+    """
+    Yields lists of companies for `stmt` using a server-side cursor.
+    The session is owned by the generator so it lives exactly as long as the stream.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            yield batch
+            # Detach rows already written so the identity map does not grow with the export
+            for company in batch:
+                db.expunge(company)
+
+
+async def stream_ndjson(stmt) -> AsyncIterator[bytes]:
+    async for batch in _iter_batches(stmt):
+        yield b"".join(orjson.dumps(company_to_dict(c), option=orjson.OPT_APPEND_NEWLINE) for c in batch)
+
+
+async def stream_csv(stmt) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    async for batch in _iter_batches(stmt):
+        writer.writerows(_csv_row(c) for c in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+# --- Parquet -----------------------------------------------------------------
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the caller in chunks."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _parquet_schema(pa):
+    string_list = pa.list_(pa.string())
+    return pa.schema([
+        ("id", pa.int64()),
+        ("cik", pa.string()),
+        ("name", pa.string()),
+        ("city", pa.string()),
+        ("state", pa.string()),
+        ("industry", pa.string()),
+        ("founded_year", pa.string()),
+        ("latest_filing_date", pa.date32()),
+        ("revenue_range", pa.string()),
+        ("amount_sold", pa.string()),
+        ("jurisdiction", pa.string()),
+        ("executive_name", pa.string()),
+        ("executive_title", pa.string()),
+        ("website_url", pa.string()),
+        ("careers_url", pa.string()),
+        ("maturity_info", pa.struct([
+            ("age", pa.int64()),
+            ("stage", pa.string()),
+            ("is_early_stage", pa.bool_()),
+        ])),
+        ("funding_details", pa.struct([
+            ("grant_size", pa.string()),
+            ("bottlenecks", string_list),
+            ("milestones", string_list),
+        ])),
+        ("founder_analysis", pa.struct([
+            ("technical_score", pa.int64()),
+            ("design_score", pa.int64()),
+            ("likely_gaps", string_list),
+        ])),
+        ("public_presence_quality", pa.struct([
+            ("website_status", pa.string()),
+            ("has_ui_artifacts", pa.bool_()),
+            ("quality_score", pa.string()),
+        ])),
+        ("hiring_signal", pa.struct([
+            ("is_hiring", pa.bool_()),
+            ("hiring_velocity", pa.string()),
+        ])),
+        ("design_opportunity", pa.struct([
+            ("phase", pa.string()),
+            ("needs", string_list),
+            ("priority", pa.string()),
+            ("ai_design_opportunities", string_list),
+            ("founder_insights", pa.string()),
+            ("market_positioning", pa.string()),
+            ("confidence_score", pa.string()),
+            ("key_questions", string_list),
+        ])),
+        ("engagement_recommendation", pa.string()),
+        ("enrichment_status", pa.string()),
+    ])
+
+
+def _coerce(value, arrow_type, pa):
+    """Coerces a decoded JSON value to `arrow_type`, mapping mismatches (e.g. age "Unknown") to null."""
+    if value is None:
+        return None
+    if pa.types.is_struct(arrow_type):
+        if not isinstance(value, dict):
+            return None
+        return {f.name: _coerce(value.get(f.name), f.type, pa) for f in arrow_type}
+    if pa.types.is_list(arrow_type):
+        if not isinstance(value, list):
+            return None
+        return [_coerce(v, arrow_type.value_type, pa) for v in value]
+    if pa.types.is_boolean(arrow_type):
+        return value if isinstance(value, bool) else None
+    if pa.types.is_integer(arrow_type):
+        if isinstance(value, bool):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if pa.types.is_string(arrow_type):
+        return value if isinstance(value, str) else json.dumps(value)
+    return value
+
+
+async def stream_parquet(stmt) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema(pa)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    try:
+        async for batch in _iter_batches(stmt):
+            columns = {field.name: [] for field in schema}
+            for company in batch:
+                for field in schema:
+                    value = getattr(company, field.name)
+                    if field.name in SIGNAL_FIELDS:
+                        value = _coerce(decode_signal(value), field.type, pa)
+                    columns[field.name].append(value)
+            # Each batch becomes one row group, flushed to the client immediately
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_export(export_format: str, stmt) -> AsyncIterator[bytes]:
+    if export_format == "ndjson":
+        return stream_ndjson(stmt)
+    if export_format == "csv":
+        return stream_csv(stmt)
+    if export_format == "parquet":
+        return stream_parquet(stmt)
+    raise ValueError(f"Unsupported export format: {export_format}")
@@ -0,0 +1,139 @@
+"""
+Shared health of the hosts we probe (company websites, careers pages, search).
+Two fail-fast checks run before a request to a host starts:
+  - DNS: each host is resolved once and the answer cached, negative answers
+    included, so a domain that does not exist costs one lookup instead of a
+    timeout per probe (NXDOMAIN for HOST_DNS_NEGATIVE_TTL_SECONDS, temporary
+    resolver failures for HOST_DNS_RETRY_SECONDS).
+  - Circuit breaker: after HOST_FAILURE_THRESHOLD consecutive connection
+    errors or timeouts the host's circuit opens and requests fail immediately
+    for HOST_COOLDOWN_SECONDS; then one trial request is let through, which
+    closes the circuit on success or reopens it on failure.
+Failing fast raises HostUnavailable, a requests.ConnectionError, so callers
+treat it like the timeout it replaces. Used through HostLimiter.slot().
+"""
+import socket
+import threading
+import time
+
+import requests
+
+from .config import (
+    HOST_COOLDOWN_SECONDS,
+    HOST_DNS_NEGATIVE_TTL_SECONDS,
+    HOST_DNS_RETRY_SECONDS,
+    HOST_DNS_TTL_SECONDS,
+    HOST_FAILURE_THRESHOLD,
+)
+
+# Errors that say the host is down; HTTP error statuses come from a live server
+HOST_FAILURES = (requests.ConnectionError, requests.Timeout)
+
+
+class HostUnavailable(requests.ConnectionError):
+    """Raised instead of sending a request to a host known to be unreachable."""
+
+    def __init__(self, host: str, reason: str):
+        super().__init__(f"{host}: {reason}")
+        self.host = host
+        self.reason = reason
+
+
+class _Circuit:
+    __slots__ = ("failures", "open_until", "trial")
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial = False
+
+
+class HostHealth:
+    def __init__(
+        self,
+        failure_threshold: int = HOST_FAILURE_THRESHOLD,
+        cooldown: float = HOST_COOLDOWN_SECONDS,
+        dns_ttl: float = HOST_DNS_TTL_SECONDS,
+        dns_negative_ttl: float = HOST_DNS_NEGATIVE_TTL_SECONDS,
+        dns_retry: float = HOST_DNS_RETRY_SECONDS,
+        resolver=socket.getaddrinfo,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.dns_ttl = dns_ttl
+        self.dns_negative_ttl = dns_negative_ttl
+        self.dns_retry = dns_retry
+        self.resolver = resolver
+        # host -> (resolved, error reason or None, expires at)
+        self._dns: dict[str, tuple] = {}
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+        self.fast_failures = {"dns": 0, "circuit_open": 0}
+        self.dns_lookups = 0
+
+    def _resolve(self, host: str) -> tuple:
+        now = time.monotonic()
+        cached = self._dns.get(host)
+        if cached is not None and cached[2] > now:
+            return cached
+        self.dns_lookups += 1
+        try:
+            self.resolver(host, None)
+            entry = (True, None, now + self.dns_ttl)
+        except socket.gaierror as e:
+            if e.errno in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)):
+                entry = (False, "does not resolve", now + self.dns_negative_ttl)
+            else:
+                # Resolver trouble says nothing about the domain; ask again soon
+                entry = (False, f"DNS lookup failed ({e})", now + self.dns_retry)
+        except (UnicodeError, OSError) as e:
+            entry = (False, f"DNS lookup failed ({e})", now + self.dns_retry)
+        self._dns[host] = entry
+        return entry
+
+    def check(self, host: str, hostname: str = None):
+        """
+        Raises HostUnavailable if a request to this host should not be sent now.
+        `hostname` is the name actually resolved when it differs from the host key
+        (e.g. "www.example.com" for "example.com").
+        """
+        if not host:
+            return
+        resolved, reason, _ = self._resolve(hostname or host)
+        if not resolved:
+            self.fast_failures["dns"] += 1
+            raise HostUnavailable(host, reason)
+        with self._lock:
+            circuit = self._circuits.get(host)
+            if circuit is None or circuit.open_until == 0.0:
+                return
+            if time.monotonic() < circuit.open_until or circuit.trial:
+                self.fast_failures["circuit_open"] += 1
+                raise HostUnavailable(host, "circuit open after repeated failures")
+            # Cooldown over: this request is the trial
+            circuit.trial = True
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._circuits.pop(host, None)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            circuit = self._circuits.setdefault(host, _Circuit())
+            circuit.failures += 1
+            if circuit.trial or circuit.failures >= self.failure_threshold:
+                circuit.open_until = time.monotonic() + self.cooldown
+                circuit.trial = False
+
+    def open_circuits(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(1 for circuit in self._circuits.values() if circuit.open_until > now)
+
+    def reset(self):
+        with self._lock:
+            self._dns.clear()
+            self._circuits.clear()
+
+
+host_health = HostHealth()
@@ -0,0 +1,90 @@
+"""
+Per-host politeness for outbound requests to company websites and search.
+Each host gets at most `max_concurrent` requests in flight and its requests
+start at least `min_interval` seconds apart, however many threads (ingestion,
+re-verification workers) share the limiter. Hosts that do not resolve or keep
+failing are refused before waiting for a slot (backend.host_health).
+"""
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from .config import HOST_MAX_CONCURRENT, HOST_MIN_INTERVAL_SECONDS, SEARCH_MIN_INTERVAL_SECONDS
+from .host_health import HOST_FAILURES, host_health
+
+SEARCH_HOST = "duckduckgo.com"
+
+
+def host_of(url_or_host: str) -> str:
+    host = urlparse(url_or_host).netloc if "://" in url_or_host else url_or_host
+    host = host.lower().split("@")[-1].split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+class _HostState:
+    __slots__ = ("semaphore", "lock", "next_start", "min_interval")
+
+    def __init__(self, max_concurrent: int, min_interval: float):
+        self.semaphore = threading.BoundedSemaphore(max_concurrent)
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+        self.min_interval = min_interval
+
+
+class HostLimiter:
+    def __init__(
+        self,
+        max_concurrent: int = HOST_MAX_CONCURRENT,
+        min_interval: float = HOST_MIN_INTERVAL_SECONDS,
+        overrides: dict = None,
+        health=host_health,
+    ):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        # host -> (max_concurrent, min_interval)
+        self.overrides = overrides or {}
+        self.health = health
+        self._hosts: dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                max_concurrent, min_interval = self.overrides.get(
+                    host, (self.max_concurrent, self.min_interval)
+                )
+                state = self._hosts[host] = _HostState(max_concurrent, min_interval)
+            return state
+
+    @contextmanager
+    def slot(self, url_or_host: str):
+        """
+        Blocks until a request to this host may start; held for the request's
+        duration. Raises HostUnavailable at once for hosts known to be down.
+        """
+        host = host_of(url_or_host)
+        hostname = urlparse(url_or_host).hostname if "://" in url_or_host else None
+        self.health.check(host, hostname)
+        state = self._state(host)
+        with state.semaphore:
+            with state.lock:
+                now = time.monotonic()
+                start = max(now, state.next_start)
+                state.next_start = start + state.min_interval
+            if start > now:
+                time.sleep(start - now)
+            try:
+                yield
+            except HOST_FAILURES:
+                self.health.record_failure(host)
+                raise
+            except Exception:
+                # Anything else (bad content, parse errors) means the host answered
+                self.health.record_success(host)
+                raise
+            self.health.record_success(host)
+
+
+host_limiter = HostLimiter(overrides={SEARCH_HOST: (1, SEARCH_MIN_INTERVAL_SECONDS)})
@@ -4,13 +4,33 @@ from urllib.parse import urlparse
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from .models import SessionLocal, Company
+from .cache import bump_data_version
+from .archive import FilingArchive, record_archived_filing
+from .metrics import QUEUE_DEPTH, SecRequestMetrics, record_request, stage, status_outcome
+from .profiling import RunProfiler, new_run_id, traced_entry
+from .lookups import CAREERS, WEBSITE, lookup_due, record_lookup
+from .host_limits import SEARCH_HOST, host_limiter
+from .domains import in_domain, is_ats, is_blocked, registrable_domain
+from .entities import normalize_name, resolve_company
 from sec_downloader import Downloader
+from sec_downloader.streaming import mapped_file
+from sec_downloader.throttle import is_transient_error
 from bs4 import BeautifulSoup
 import re
+import os
+import shutil
+import tempfile
 import time
 import json
 from contextlib import contextmanager
-from .config import ATS_DOMAINS, URL_BLOCKLIST, SEC_USER_AGENT_NAME, SEC_USER_AGENT_EMAIL
+from .config import SEC_USER_AGENT_NAME, SEC_USER_AGENT_EMAIL, ARCHIVE_FILINGS
+
+filing_archive = FilingArchive()
+
+# Pause before the second pass over filings whose SEC requests kept failing
+DEFERRED_RETRY_DELAY_SECONDS = 30
+# Trace outcomes of entries that wrote company data
+COMPANY_CHANGED_OUTCOMES = {"added", "updated"}
 
 def analyze_maturity(founded_year: str) -> dict:
     """
@@ -105,6 +125,7 @@ def analyze_founders(executive_name: str) -> dict:
     
     return technical_mapping
 
+@stage("presence_check")
 def analyze_public_presence(website_url: str) -> dict:
     """
     Checks website availability and quality signals.
@@ -123,7 +144,9 @@ def analyze_public_presence(website_url: str) -> dict:
         headers = {
             "User-Agent": f"{SEC_USER_AGENT_NAME} {SEC_USER_AGENT_EMAIL}"
         }
-        resp = requests.head(website_url, headers=headers, timeout=5, allow_redirects=True)
+        with host_limiter.slot(website_url):
+            resp = requests.head(website_url, headers=headers, timeout=5, allow_redirects=True)
+        record_request(website_url, status_outcome(resp.status_code))
         
         if resp.status_code < 400:
             presence["website_status"] = "Active"
@@ -133,6 +156,7 @@ def analyze_public_presence(website_url: str) -> dict:
             # parsing content is expensive so maybe skip for now or do light check
             
     except Exception:
+        record_request(website_url, "error")
         presence["website_status"] = "Unreachable"
 
     return presence
@@ -211,6 +235,21 @@ def infer_design_opportunity(maturity: dict, funding: dict, founders: dict, pres
 # SEC FD (Form D) Atom Feed Base URL
 SEC_FEED_BASE_URL = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&CIK=&type=D&company=&dateb=&owner=include&start=0&output=atom"
 
+def search_web(ddgs, query: str) -> list:
+    """
+    DuckDuckGo text search, paced by the shared host limiter and counted
+    in the external request metrics.
+    """
+    try:
+        with host_limiter.slot(SEARCH_HOST):
+            results = list(ddgs.text(query, max_results=10, region='us-en'))
+    except Exception:
+        record_request(SEARCH_HOST, "error")
+        raise
+    record_request(SEARCH_HOST, "ok")
+    return results
+
+@stage("website_search")
 def get_company_url(name: str, city: str = None, state: str = None) -> str:
     """
     Searches for the company's website URL using DuckDuckGo (via duckduckgo_search).
@@ -229,14 +268,11 @@ def get_company_url(name: str, city: str = None, state: str = None) -> str:
     query = " ".join(query_parts)
     
     def process_results(results, name):
-        # improved normalization
-        normalized_name = name.lower()
-        for suffix in [" inc", " llc", " corp", " ltd", " co", "."]:
-            normalized_name = normalized_name.replace(suffix, "")
-        normalized_name = normalized_name.replace(" ", "").replace(",", "")
-
-        # Blocklist
-        blocklist = URL_BLOCKLIST
+        # Same normalization as entity resolution, without spaces to compare with domains
+        normalized_name = normalize_name(name).replace(" ", "")
+        if not normalized_name:
+            # No ASCII letters or digits (e.g. "株式会社"): "" would match every domain
+            return None
 
         for r in results:
             link = r.get('href')
@@ -245,7 +281,7 @@ def get_company_url(name: str, city: str = None, state: str = None) -> str:
             domain = urlparse(link).netloc.lower()
             if domain.startswith("www."): domain = domain[4:]
             
-            if any(b in domain for b in blocklist):
+            if is_blocked(domain):
                 continue
                 
             # STRICT MATCHING ONLY
@@ -256,17 +292,10 @@ def get_company_url(name: str, city: str = None, state: str = None) -> str:
                      return link
                  
                  # FALLBACK: If verification failed (maybe 403) but it's an EXACT match
-                 # Only allowed if the domain parts are few (e.g. openai.com -> ['openai', 'com'])
-                 # This prevents 'learn.microsoft.com' (parts=['learn', 'microsoft', 'com']) from matching 'Learn'
-                 
-                 parts = domain.split('.')
-                 if len(parts) == 2:
-                     if parts[0] == normalized_name:
-                         return link
-                         
-                 # Special case for .co.uk etc? 
-                 # If len is 3 and last two are short? e.g. google.co.uk
-                 # Let's keep it simple and safe for now. 2 parts is best for strict fallback.
+                 # Only allowed for a registrable domain (openai.com, acme.co.uk), never a subdomain:
+                 # this prevents 'learn.microsoft.com' from matching 'Learn'
+                 if domain == registrable_domain(domain) and domain.split('.', 1)[0] == normalized_name:
+                     return link
                  
             # 2. Normalized name matched inside? verification MUST pass.
             if normalized_name in domain:
@@ -283,20 +312,20 @@ def get_company_url(name: str, city: str = None, state: str = None) -> str:
         with DDGS() as ddgs:
             # 1. Simple query (Often best for exact matches)
             query = name
-            results = list(ddgs.text(query, max_results=10, region='us-en'))
+            results = search_web(ddgs, query)
             found = process_results(results, name)
             if found: return found
             
             # 2. Specific query with location (if available)
             if city and city != "Unknown" and state and state != "Unknown":
                 loc_query = f"{name} {city} {state} website"
-                results = list(ddgs.text(loc_query, max_results=10, region='us-en'))
+                results = search_web(ddgs, loc_query)
                 found = process_results(results, name)
                 if found: return found
 
             # 3. "Official Website" query as fallback
             simple_query = f"{name} official website"
-            results = list(ddgs.text(simple_query, max_results=10, region='us-en'))
+            results = search_web(ddgs, simple_query)
             return process_results(results, name)
                 
     except Exception as e:
@@ -304,6 +333,7 @@ def get_company_url(name: str, city: str = None, state: str = None) -> str:
         return None
     return None
 
+@stage("verification")
 def verify_website_content(url: str, company_name: str) -> bool:
     """
     Verifies if the website content actually relates to the company.
@@ -315,7 +345,9 @@ def verify_website_content(url: str, company_name: str) -> bool:
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
-        resp = requests.get(url, headers=headers, timeout=5)
+        with host_limiter.slot(url):
+            resp = requests.get(url, headers=headers, timeout=5)
+        record_request(url, status_outcome(resp.status_code))
         
         # If we get a 403/401, we can't verify, so we should assume False 
         # UNLESS the caller handles this case. But here we just return False.
@@ -354,9 +386,11 @@ def verify_website_content(url: str, company_name: str) -> bool:
         return False
         
     except Exception:
+        record_request(url, "error")
         return False
 
 
+@stage("careers_lookup")
 def get_careers_url(name: str, website_url: str = None) -> str:
     """
     Searches for the company's careers/jobs page.
@@ -376,29 +410,29 @@ def get_careers_url(name: str, website_url: str = None) -> str:
         ]
         
         base_url = website_url.rstrip("/")
-        for path in common_paths:
-            probe_url = f"{base_url}{path}"
-            try:
-                # Use HEAD request for speed, fallback to GET if needed
-                resp = requests.head(probe_url, headers=headers, timeout=3, allow_redirects=True)
-                if resp.status_code == 200:
-                    return probe_url
-            except Exception:
-                pass
+        with stage("careers_probe"):
+            for path in common_paths:
+                probe_url = f"{base_url}{path}"
+                try:
+                    # Use HEAD request for speed, fallback to GET if needed
+                    with host_limiter.slot(probe_url):
+                        resp = requests.head(probe_url, headers=headers, timeout=3, allow_redirects=True)
+                    record_request(probe_url, status_outcome(resp.status_code))
+                    if resp.status_code == 200:
+                        return probe_url
+                except Exception:
+                    record_request(probe_url, "error")
     
     # 2. Search Engine Search
     query = f"{name} careers jobs"
-    
-    ats_domains = ATS_DOMAINS
 
     try:
         with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=10, region='us-en'))
+            results = search_web(ddgs, query)
             
             # Collect all valid links
             candidates = []
-            blocklist = URL_BLOCKLIST
-            
+
             for r in results:
                 link = r.get('href')
                 if not link: continue
@@ -406,30 +440,24 @@ def get_careers_url(name: str, website_url: str = None) -> str:
                 domain = urlparse(link).netloc.lower()
                 if domain.startswith("www."): domain = domain[4:]
                 
-                if any(b in domain for b in blocklist):
-                     # Exception: LinkedIn is okay for careers? 
-                     # Actually, maybe we want LinkedIn for careers.
-                     # But we definitely don't want "answers.microsoft.com"
-                     
-                     # Let's allow LinkedIn for careers but block others?
-                     if "linkedin.com" in domain:
-                         pass
-                     else:
-                         continue
+                # LinkedIn is blocked for websites but fine for careers;
+                # we definitely don't want "answers.microsoft.com"
+                if is_blocked(domain) and not in_domain(domain, "linkedin.com"):
+                    continue
                 
                 candidates.append(link)
 
             # Prioritize ATS domains
             for link in candidates:
-                if any(ats in link for ats in ats_domains):
+                if is_ats(link):
                     return link
             
             # If no ATS link, prioritize links on the company's own domain if known
             if website_url:
                 try:
-                    company_domain = urlparse(website_url).netloc.replace("www.", "")
+                    company_domain = registrable_domain(website_url)
                     for link in candidates:
-                         if company_domain in link and ("/careers" in link or "/jobs" in link):
+                         if registrable_domain(link) == company_domain and ("/careers" in link or "/jobs" in link):
                              return link
                 except:
                     pass
@@ -449,7 +477,7 @@ def get_careers_url(name: str, website_url: str = None) -> str:
                 # If it's a known ATS (covered above)
                 
                 # If it's LinkedIn, allow it (common for startups to only have LI)
-                if "linkedin.com" in domain:
+                if in_domain(domain, "linkedin.com"):
                     return link
                     
                 # If domain matches company name strictly
@@ -463,9 +491,12 @@ def get_careers_url(name: str, website_url: str = None) -> str:
         return None
     return None
 
-def parse_form_d(content: str) -> dict:
+@stage("parse")
+def parse_form_d(content) -> dict:
     """
     Parses Form D HTML/XML content to extract metadata.
+    Accepts text, raw bytes or a memory-mapped file, so downloaded
+    documents can be parsed without first decoding a full copy.
     """
     data = {
         "issuer_name": None,
@@ -482,8 +513,15 @@ def parse_form_d(content: str) -> dict:
     
     # Try XML parsing first for structured data
     try:
-        xml_content = content.strip()
-        root = ET.fromstring(xml_content)
+        if isinstance(content, (str, bytes)):
+            root = ET.fromstring(content.strip())
+        else:
+            # Skip leading whitespace through a view instead of copying the document
+            start = 0
+            while content[start:start + 1].isspace():
+                start += 1
+            with memoryview(content) as view:
+                root = ET.fromstring(view[start:])
         
         def get_text(element, path):
             found = element.find(path)
@@ -601,28 +639,192 @@ def parse_form_d(content: str) -> dict:
 
     return data
 
-def ingest_filings(limit: int = 10):
+def archive_filing(db, metadata, path):
+    """
+    Keeps the raw primary document in the local filing archive so it can be
+    re-parsed later (backend.reparse_archive). Failures are logged, not raised.
+    """
+    try:
+        content_hash, size = filing_archive.put_file(path)
+        record_archived_filing(
+            db,
+            accession_number=metadata.accession_number,
+            cik=metadata.cik,
+            form_type=metadata.form_type,
+            filing_date=datetime.strptime(metadata.filing_date, "%Y-%m-%d").date(),
+            content_hash=content_hash,
+            size=size,
+        )
+    except Exception as e:
+        print(f"Failed to archive filing {metadata.accession_number}: {e}")
+
+def ingest_entry(db, dl, entry, download_dir, trace_info: dict = None) -> bool:
+    """
+    Ingests one Atom feed entry. Returns True when a new company was added.
+    SEC requests still throttled or failing after retries (is_transient_error)
+    propagate so the caller can defer the filing; a permanently missing document
+    falls back to "Unknown" fields like a parse failure.
+    `trace_info` (from profiling.traced_entry) receives the filing's identity and outcome.
+    """
+    if trace_info is None:
+        trace_info = {}
+    # Built from the feed entry itself; falls back to the submissions JSON only if needed
+    with stage("metadata"):
+        metadata = dl.get_filing_metadata_from_feed_entry(entry)
+    trace_info.update(
+        cik=metadata.cik,
+        accession_number=metadata.accession_number,
+        company_name=metadata.company_name,
+    )
+
+    existing = db.query(Company).filter(Company.cik == metadata.cik).first()
+    if not existing:
+        try:
+            # Streamed to disk and parsed from a memory map, so large
+            # documents are never held as bytes plus a decoded copy
+            with stage("document_download"):
+                filing_path = dl.download_filing_to_file(
+                    url=metadata.primary_doc_url,
+                    path=os.path.join(download_dir, f"{metadata.accession_number}.xml"),
+                )
+            try:
+                with mapped_file(filing_path) as content:
+                    parsed_data = parse_form_d(content)
+                if ARCHIVE_FILINGS:
+                    archive_filing(db, metadata, filing_path)
+            finally:
+                os.unlink(filing_path)
+        except Exception as e:
+            if is_transient_error(e):
+                # SEC still throttling/failing after retries: defer the whole filing
+                raise
+            # Parse failures and permanent HTTP errors (e.g. 404 on the document)
+            print(f"Failed to download/parse HTML for {metadata.cik}: {e}")
+            parsed_data = {
+                "issuer_name": None,
+                "city": "Unknown",
+                "state": "Unknown",
+                "industry": "Unknown",
+                "founded_year": "Unknown",
+                "revenue_range": "Unknown",
+                "amount_sold": "Unknown",
+                "jurisdiction": "Unknown",
+                "executive_name": "Unknown",
+                "executive_title": "Unknown"
+            }
+
+        # Retrieve website URL
+        company_name = parsed_data.get("issuer_name") or metadata.company_name
+        website_url = get_company_url(company_name, parsed_data.get("city"), parsed_data.get("state"))
+
+        # Sleep to respect rate limits
+        with stage("rate_limit_sleep"):
+            time.sleep(1) 
+
+        # Retrieve Careers URL
+        careers_url = get_careers_url(company_name, website_url)
+        record_lookup(db, metadata.cik, WEBSITE, bool(website_url))
+        record_lookup(db, metadata.cik, CAREERS, bool(careers_url))
+
+        # Sleep to respect rate limits
+        with stage("rate_limit_sleep"):
+            time.sleep(1)
+
+        # Run Intelligence Analysis
+        maturity = analyze_maturity(parsed_data.get("founded_year"))
+        funding = analyze_funding(parsed_data)
+        founders = analyze_founders(parsed_data.get("executive_name"))
+        presence = analyze_public_presence(website_url)
+        hiring = analyze_hiring_signal(careers_url, datetime.strptime(metadata.filing_date, "%Y-%m-%d").date())
+
+        opportunity_inference = infer_design_opportunity(maturity, funding, founders, presence, hiring)
+
+        company = Company(
+            cik=metadata.cik,
+            name=company_name,
+            latest_filing_date=datetime.strptime(metadata.filing_date, "%Y-%m-%d").date(),
+            industry=parsed_data["industry"], 
+            city=parsed_data["city"],
+            state=parsed_data["state"],
+            founded_year=parsed_data["founded_year"],
+            revenue_range=parsed_data["revenue_range"],
+            amount_sold=parsed_data["amount_sold"],
+            jurisdiction=parsed_data["jurisdiction"],
+            executive_name=parsed_data["executive_name"],
+            executive_title=parsed_data["executive_title"],
+            website_url=website_url,
+            careers_url=careers_url,
+
+            # Intelligence Signals
+            maturity_info=json.dumps(maturity),
+            funding_details=json.dumps(funding),
+            founder_analysis=json.dumps(founders),
+            public_presence_quality=json.dumps(presence),
+            hiring_signal=json.dumps(hiring),
+            design_opportunity=json.dumps(opportunity_inference["design_opportunity"]),
+            engagement_recommendation=opportunity_inference["engagement_recommendation"]
+        )
+        db.add(company)
+        with stage("entity_resolution"):
+            resolve_company(db, company)
+        trace_info.update(company_name=company_name, outcome="added")
+        return True
+    else:
+        existing.latest_filing_date = datetime.strptime(metadata.filing_date, "%Y-%m-%d").date()
+        # Missing website/careers pages are searched again only once their
+        # backoff has expired (backend.lookups), not on every new filing
+        if not existing.website_url and lookup_due(db, existing.cik, WEBSITE):
+             website_url = get_company_url(existing.name, existing.city, existing.state)
+             record_lookup(db, existing.cik, WEBSITE, bool(website_url))
+             if website_url:
+                 existing.website_url = website_url
+                 existing.public_presence_quality = json.dumps(analyze_public_presence(website_url))
+             with stage("rate_limit_sleep"):
+                 time.sleep(1)
+        if not existing.careers_url and lookup_due(db, existing.cik, CAREERS):
+             company_name = existing.name
+             website_url = existing.website_url
+             careers_url = get_careers_url(company_name, website_url)
+             record_lookup(db, existing.cik, CAREERS, bool(careers_url))
+             existing.careers_url = careers_url
+             with stage("rate_limit_sleep"):
+                 time.sleep(1)
+        # Re-filings often change nothing (same date, lookups still missing)
+        trace_info["outcome"] = "updated" if db.is_modified(existing) else "unchanged"
+    return False
+
+def ingest_filings(limit: int = 10, profile: bool = False, run_id: str = None):
     """
     Fetches recent Form D filings from SEC RSS feed,
     downloads details using sec-downloader,
     and saves new companies to the DB.
+    Stage timings of every entry are stored as IngestionTrace rows under `run_id`;
+    with `profile`, entries also run under cProfile (see backend.profiling).
     """
+    run_id = run_id or new_run_id()
+    profiler = RunProfiler(run_id) if profile else None
     # Initialize Downloader
     # Initialize Downloader
-    dl = Downloader(SEC_USER_AGENT_NAME, SEC_USER_AGENT_EMAIL)
+    dl = Downloader(SEC_USER_AGENT_NAME, SEC_USER_AGENT_EMAIL, hooks=[SecRequestMetrics()])
     
     # Fetch Feed
     # Ensure we fetch enough entries from RSS
     rss_count = max(limit, 100) # Minimum 100 to be safe
     feed_url = f"{SEC_FEED_BASE_URL}&count={rss_count}"
     
-    headers = {"User-Agent": f"{SEC_USER_AGENT_NAME} {SEC_USER_AGENT_EMAIL}"}
-    response = requests.get(feed_url, headers=headers)
-    if response.status_code != 200:
-        print(f"Failed to fetch SEC feed: {response.status_code}")
+    # Conditional, gzip-compressed request: an unchanged feed is a 304 with no body
+    try:
+        with stage("feed_fetch"):
+            feed = dl.fetch(url=feed_url)
+    except requests.RequestException as e:
+        print(f"Failed to fetch SEC feed: {e}")
         return 0
+    if feed.not_modified:
+        # Entries are re-read from the cached copy, since an earlier call may
+        # have processed fewer of them (smaller limit)
+        print("SEC feed not modified since the last poll")
 
-    root = ET.fromstring(response.content)
+    root = ET.fromstring(feed.content)
     # Atom feed namespace
     ns = {'atom': 'http://www.w3.org/2005/Atom'}
     
@@ -630,100 +832,66 @@ def ingest_filings(limit: int = 10):
     
     db = SessionLocal()
     count = 0
+    # Traces and lookup bookkeeping are written on every run; only company
+    # changes invalidate API caches
+    companies_changed = False
+    deferred = []
+    download_dir = tempfile.mkdtemp(prefix="sec-filings-")
     
-    for entry in entries[:limit]:
+    entries = entries[:limit]
+    for position, entry in enumerate(entries):
+        QUEUE_DEPTH.labels("ingest_entries").set(len(entries) - position)
+        QUEUE_DEPTH.labels("ingest_deferred").set(len(deferred))
         link_href = entry.find('atom:link', ns).attrib['href']
         
         try:
-            metadatas = dl.get_filing_metadatas(link_href)
-            if not metadatas:
+            with traced_entry(db, run_id, link_href, profiler) as trace_info:
+                # One savepoint per entry: a failed write (e.g. during entity
+                # resolution) rolls back only this filing, not the whole run
+                with db.begin_nested():
+                    if ingest_entry(db, dl, entry, download_dir, trace_info):
+                        count += 1
+            companies_changed |= trace_info["outcome"] in COMPANY_CHANGED_OUTCOMES
+        except Exception as e:
+            if not is_transient_error(e):
+                print(f"Error processing {link_href}: {e}")
                 continue
-            
-            metadata = metadatas[0]
-            
-            existing = db.query(Company).filter(Company.cik == metadata.cik).first()
-            if not existing:
-                try:
-                    html_content = dl.download_filing(url=metadata.primary_doc_url).decode('utf-8', errors='ignore')
-                    parsed_data = parse_form_d(html_content)
-                except Exception as e:
-                    print(f"Failed to download/parse HTML for {metadata.cik}: {e}")
-                    parsed_data = {
-                        "issuer_name": None,
-                        "city": "Unknown",
-                        "state": "Unknown",
-                        "industry": "Unknown",
-                        "founded_year": "Unknown",
-                        "revenue_range": "Unknown",
-                        "amount_sold": "Unknown",
-                        "jurisdiction": "Unknown",
-                        "executive_name": "Unknown",
-                        "executive_title": "Unknown"
-                    }
-
-                # Retrieve website URL
-                company_name = parsed_data.get("issuer_name") or metadata.company_name
-                website_url = get_company_url(company_name, parsed_data.get("city"), parsed_data.get("state"))
-                
-                # Sleep to respect rate limits
-                time.sleep(1) 
-                
-                # Retrieve Careers URL
-                careers_url = get_careers_url(company_name, website_url)
-                
-                # Sleep to respect rate limits
-                time.sleep(1)
-
-                # Run Intelligence Analysis
-                maturity = analyze_maturity(parsed_data.get("founded_year"))
-                funding = analyze_funding(parsed_data)
-                founders = analyze_founders(parsed_data.get("executive_name"))
-                presence = analyze_public_presence(website_url)
-                hiring = analyze_hiring_signal(careers_url, datetime.strptime(metadata.filing_date, "%Y-%m-%d").date())
-                
-                opportunity_inference = infer_design_opportunity(maturity, funding, founders, presence, hiring)
-                
-                company = Company(
-                    cik=metadata.cik,
-                    name=company_name,
-                    latest_filing_date=datetime.strptime(metadata.filing_date, "%Y-%m-%d").date(),
-                    industry=parsed_data["industry"], 
-                    city=parsed_data["city"],
-                    state=parsed_data["state"],
-                    founded_year=parsed_data["founded_year"],
-                    revenue_range=parsed_data["revenue_range"],
-                    amount_sold=parsed_data["amount_sold"],
-                    jurisdiction=parsed_data["jurisdiction"],
-                    executive_name=parsed_data["executive_name"],
-                    executive_title=parsed_data["executive_title"],
-                    website_url=website_url,
-                    careers_url=careers_url,
-                    
-                    # Intelligence Signals
-                    maturity_info=json.dumps(maturity),
-                    funding_details=json.dumps(funding),
-                    founder_analysis=json.dumps(founders),
-                    public_presence_quality=json.dumps(presence),
-                    hiring_signal=json.dumps(hiring),
-                    design_opportunity=json.dumps(opportunity_inference["design_opportunity"]),
-                    engagement_recommendation=opportunity_inference["engagement_recommendation"]
-                )
-                db.add(company)
-                count += 1
-            else:
-                existing.latest_filing_date = datetime.strptime(metadata.filing_date, "%Y-%m-%d").date()
-                if not existing.careers_url:
-                     company_name = existing.name
-                     website_url = existing.website_url
-                     careers_url = get_careers_url(company_name, website_url)
-                     existing.careers_url = careers_url
-                     time.sleep(1) 
+            # Throttled or unreachable even after retries: try again at the end
+            print(f"Deferring {link_href}: {e}")
+            deferred.append(entry)
+
+    if deferred:
+        # The adaptive throttle has slowed down by now; wait out one more cooldown
+        print(f"Retrying {len(deferred)} deferred filings...")
+        time.sleep(DEFERRED_RETRY_DELAY_SECONDS)
+        for position, entry in enumerate(deferred):
+            QUEUE_DEPTH.labels("ingest_deferred").set(len(deferred) - position)
+            link_href = entry.find('atom:link', ns).attrib['href']
+            try:
+                with traced_entry(db, run_id, link_href, profiler) as trace_info:
+                    with db.begin_nested():
+                        if ingest_entry(db, dl, entry, download_dir, trace_info):
+                            count += 1
+                companies_changed |= trace_info["outcome"] in COMPANY_CHANGED_OUTCOMES
+            except Exception as e:
+                print(f"Error processing {link_href} after retry: {e}")
+
+    QUEUE_DEPTH.labels("ingest_entries").set(0)
+    QUEUE_DEPTH.labels("ingest_deferred").set(0)
+
+    with stage("db_write"):
+        if companies_changed:
+            bump_data_version(db)
+        db.commit()
+    db.close()
+    shutil.rmtree(download_dir, ignore_errors=True)
 
-        
-        except Exception as e:
-            print(f"Error processing {link_href}: {e}")
-            continue
+    if profiler is not None:
+        print(f"Ingestion profile written to {profiler.dump()}")
 
-    db.commit()
-    db.close()
+    sec_traffic = dl.request_stats.total()
+    print(
+        f"SEC traffic: {sec_traffic['requests']} requests, "
+        f"{sec_traffic['bytes'] / 1024:.0f} KiB, {sec_traffic['cache_hits']} not modified"
+    )
     return count
@@ -0,0 +1,292 @@
+"""
+Background liveness monitor for company websites and careers pages.
+Each link has its own schedule in link_checks: after a check with an unchanged
+status the interval grows by LINK_CHECK_BACKOFF (up to LINK_CHECK_MAX_DAYS),
+after a change it drops back to LINK_CHECK_MIN_HOURS. A run checks at most
+--budget overdue links, most overdue first, with pooled HEAD requests under
+the shared per-host limits. Only companies whose link status changed are
+updated (presence / hiring signals and the derived design opportunity).
+
+Usage:
+    python -m backend.link_monitor
+    python -m backend.link_monitor --budget 2000 --workers 32
+    python -m backend.link_monitor --every 15   # keep running, one pass every 15 minutes
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+from sqlalchemy import and_, select, update
+
+from .cache import bump_data_version
+from .config import (
+    LINK_CHECK_BACKOFF,
+    LINK_CHECK_BUDGET,
+    LINK_CHECK_MAX_DAYS,
+    LINK_CHECK_MIN_HOURS,
+    SEC_USER_AGENT_EMAIL,
+    SEC_USER_AGENT_NAME,
+)
+from .host_limits import host_limiter
+from .ingestion import analyze_hiring_signal, infer_design_opportunity
+from .metrics import record_request, stage, status_outcome
+from .models import Base, Company, LinkCheck, SessionLocal, engine
+
+WEBSITE = "website"
+CAREERS = "careers"
+LINK_COLUMNS = {WEBSITE: Company.website_url, CAREERS: Company.careers_url}
+
+# Servers that do not implement HEAD answer with one of these
+HEAD_UNSUPPORTED = {405, 501}
+CHECK_TIMEOUT_SECONDS = 5
+DEFAULT_WORKERS = 16
+
+_session = requests.Session()
+_session.headers["User-Agent"] = f"{SEC_USER_AGENT_NAME} {SEC_USER_AGENT_EMAIL}"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def _pool_session(workers: int):
+    # One keep-alive connection pool per host, sized for the worker count
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    _session.mount("http://", adapter)
+    _session.mount("https://", adapter)
+
+
+def check_link(url: str) -> tuple:
+    """(status, http status) of one URL: Active (< 400), Broken (>= 400) or Unreachable."""
+    try:
+        with host_limiter.slot(url):
+            resp = _session.head(url, timeout=CHECK_TIMEOUT_SECONDS, allow_redirects=True)
+            if resp.status_code in HEAD_UNSUPPORTED:
+                resp = _session.get(url, timeout=CHECK_TIMEOUT_SECONDS, allow_redirects=True, stream=True)
+                resp.close()
+    except requests.RequestException:
+        record_request(url, "error")
+        return "Unreachable", None
+    record_request(url, status_outcome(resp.status_code))
+    return ("Active" if resp.status_code < 400 else "Broken"), resp.status_code
+
+
+def next_interval(interval_hours: float, changed: bool) -> float:
+    if changed:
+        return LINK_CHECK_MIN_HOURS
+    return min(interval_hours * LINK_CHECK_BACKOFF, LINK_CHECK_MAX_DAYS * 24)
+
+
+def _jittered(now: datetime, hours: float) -> datetime:
+    # +-10% so links seeded together do not stay due together
+    return now + timedelta(hours=hours * random.uniform(0.9, 1.1))
+
+
+def seed_link_checks(db) -> int:
+    """Adds due schedule rows for company links that have none yet."""
+    added = 0
+    now = _now()
+    for kind, column in LINK_COLUMNS.items():
+        stmt = (
+            select(Company.id, column)
+            .outerjoin(LinkCheck, and_(LinkCheck.company_id == Company.id, LinkCheck.kind == kind))
+            .where(column.is_not(None), column != "", LinkCheck.company_id.is_(None))
+        )
+        rows = db.execute(stmt).all()
+        db.add_all(
+            LinkCheck(company_id=company_id, kind=kind, url=url, interval_hours=LINK_CHECK_MIN_HOURS, next_check_at=now)
+            for company_id, url in rows
+        )
+        added += len(rows)
+    db.commit()
+    return added
+
+
+def _decode(value) -> dict:
+    try:
+        decoded = json.loads(value) if value else {}
+    except ValueError:
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def presence_for(status: str, current: dict) -> dict:
+    """Presence signal for a website status, with the rules of analyze_public_presence."""
+    presence = {**current}
+    if status == "Active":
+        if current.get("website_status") != "Active":
+            presence["quality_score"] = "Medium"
+        presence["website_status"] = "Active"
+    else:
+        presence["website_status"] = "Unreachable" if status == "Unreachable" else "Missing"
+        presence["quality_score"] = "Low"
+    return presence
+
+
+def stored_status(company: dict, kind: str) -> str:
+    """Link status the company's signals currently reflect."""
+    if kind == WEBSITE:
+        website_status = _decode(company["public_presence_quality"]).get("website_status")
+        return {"Active": "Active", "Unreachable": "Unreachable"}.get(website_status, "Broken")
+    # Careers URLs are stored only once found, so they start out Active
+    return _decode(company["hiring_signal"]).get("careers_page_status", "Active")
+
+
+def company_changes(company: dict, statuses: dict) -> dict:
+    """
+    Column updates for a company whose link statuses changed: presence and/or
+    hiring signals, and the design opportunity derived from them. AI-enriched
+    keys are kept, as is the AI engagement recommendation once enrichment completed.
+    """
+    changes = {}
+    presence = _decode(company["public_presence_quality"])
+    hiring = _decode(company["hiring_signal"])
+    if WEBSITE in statuses:
+        presence = presence_for(statuses[WEBSITE], presence)
+        changes["public_presence_quality"] = json.dumps(presence)
+    if CAREERS in statuses:
+        alive = statuses[CAREERS] == "Active"
+        hiring = {
+            **hiring,
+            **analyze_hiring_signal(company["careers_url"] if alive else None, company["latest_filing_date"]),
+            "careers_page_status": statuses[CAREERS],
+        }
+        changes["hiring_signal"] = json.dumps(hiring)
+
+    inferred = infer_design_opportunity(
+        _decode(company["maturity_info"]),
+        _decode(company["funding_details"]),
+        _decode(company["founder_analysis"]),
+        presence,
+        hiring,
+    )
+    changes["design_opportunity"] = json.dumps(
+        {**_decode(company["design_opportunity"]), **inferred["design_opportunity"]}
+    )
+    if company["enrichment_status"] != "completed":
+        changes["engagement_recommendation"] = inferred["engagement_recommendation"]
+    return changes
+
+
+COMPANY_COLUMNS = (
+    "id", "website_url", "careers_url", "latest_filing_date", "maturity_info", "funding_details",
+    "founder_analysis", "public_presence_quality", "hiring_signal", "design_opportunity", "enrichment_status",
+)
+
+
+def select_due(db, budget: int) -> list:
+    """Overdue links, most overdue first, as (link, company) plain dicts."""
+    link_columns = [LinkCheck.company_id, LinkCheck.kind, LinkCheck.url, LinkCheck.status, LinkCheck.interval_hours, LinkCheck.last_changed_at]
+    company_columns = [getattr(Company, column) for column in COMPANY_COLUMNS]
+    rows = db.execute(
+        select(*link_columns, *company_columns)
+        .join(Company, Company.id == LinkCheck.company_id)
+        .where(LinkCheck.next_check_at <= _now())
+        .order_by(LinkCheck.next_check_at)
+        .limit(budget)
+    ).all()
+    split = len(link_columns)
+    return [
+        (
+            dict(zip(("company_id", "kind", "url", "status", "interval_hours", "last_changed_at"), row[:split])),
+            dict(zip(COMPANY_COLUMNS, row[split:])),
+        )
+        for row in rows
+    ]
+
+
+def run_link_monitor(budget: int = LINK_CHECK_BUDGET, workers: int = DEFAULT_WORKERS) -> dict:
+    db = SessionLocal()
+    stats = {"seeded": 0, "checked": 0, "changed": 0, "companies_updated": 0}
+    try:
+        stats["seeded"] = seed_link_checks(db)
+        due = select_due(db, budget)
+        # Release the read transaction while checking
+        db.commit()
+
+        checks, removed = [], []
+        for link, company in due:
+            url = company[f"{link['kind']}_url"]
+            if url:
+                checks.append((link, company, url))
+            else:
+                removed.append(link)
+
+        _pool_session(workers)
+        with stage("link_check"), ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(lambda check: check_link(check[2]), checks))
+
+        now = _now()
+        link_updates = []
+        changed_statuses = {}
+        companies = {}
+        for (link, company, url), (status, http_status) in zip(checks, results):
+            # First checks and URLs replaced since the last check also restart the schedule
+            changed = status != link["status"] or url != link["url"]
+            stats["changed"] += link["status"] is not None and status != link["status"]
+            interval = next_interval(link["interval_hours"], changed)
+            link_updates.append({
+                "company_id": link["company_id"],
+                "kind": link["kind"],
+                "url": url,
+                "status": status,
+                "http_status": http_status,
+                "interval_hours": interval,
+                "last_checked_at": now,
+                "last_changed_at": now if changed else link["last_changed_at"],
+                "next_check_at": _jittered(now, interval),
+            })
+            if status != stored_status(company, link["kind"]):
+                changed_statuses.setdefault(company["id"], {})[link["kind"]] = status
+                companies[company["id"]] = company
+
+        company_updates = [
+            {"id": company_id, **company_changes(companies[company_id], statuses)}
+            for company_id, statuses in changed_statuses.items()
+        ]
+
+        if removed:
+            # The company no longer has this link
+            for link in removed:
+                db.query(LinkCheck).filter_by(company_id=link["company_id"], kind=link["kind"]).delete()
+        # Bulk UPDATE by primary key; only companies whose status changed are written
+        if link_updates:
+            db.execute(update(LinkCheck), link_updates)
+        if company_updates:
+            db.execute(update(Company), company_updates)
+            bump_data_version(db)
+        db.commit()
+        stats["checked"] = len(checks)
+        stats["companies_updated"] = len(company_updates)
+    finally:
+        db.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget", type=int, default=LINK_CHECK_BUDGET, help="Maximum links checked per pass")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent checks")
+    parser.add_argument("--every", type=float, help="Repeat a pass every N minutes instead of exiting")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    while True:
+        start = time.perf_counter()
+        stats = run_link_monitor(args.budget, args.workers)
+        print(
+            f"Checked {stats['checked']} links ({stats['seeded']} new), {stats['changed']} changed, "
+            f"{stats['companies_updated']} companies updated in {time.perf_counter() - start:.1f}s"
+        )
+        if args.every is None:
+            break
+        time.sleep(args.every * 60)
+
+
+if __name__ == "__main__":
+    main()
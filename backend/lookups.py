@@ -0,0 +1,64 @@
+"""
+Negative-result TTL for website and careers discovery.
+Each company keeps one LookupAttempt row per kind. A lookup that finds nothing
+is retried after LOOKUP_RETRY_BASE_HOURS, doubling with every consecutive miss
+up to LOOKUP_RETRY_MAX_DAYS, so ingesting another filing from a company without
+a careers page does not repeat the HEAD probes and searches every time.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from .config import LOOKUP_RETRY_BASE_HOURS, LOOKUP_RETRY_MAX_DAYS
+from .models import LookupAttempt
+
+WEBSITE = "website"
+CAREERS = "careers"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def retry_delay(consecutive_misses: int) -> timedelta:
+    """Wait before the next lookup after `consecutive_misses` (>= 1) misses in a row."""
+    hours = LOOKUP_RETRY_BASE_HOURS * 2 ** (consecutive_misses - 1)
+    return min(timedelta(hours=hours), timedelta(days=LOOKUP_RETRY_MAX_DAYS))
+
+
+def _attempt(db: Session, cik: str, kind: str) -> Optional[LookupAttempt]:
+    row = db.get(LookupAttempt, (cik, kind))
+    if row is None:
+        # Rows added earlier in the same (not yet flushed) ingestion batch
+        for obj in db.new:
+            if isinstance(obj, LookupAttempt) and obj.cik == cik and obj.kind == kind:
+                return obj
+    return row
+
+
+def lookup_due(db: Session, cik: str, kind: str, now: datetime = None) -> bool:
+    """True when the company was never looked up, or its backoff has expired."""
+    row = _attempt(db, cik, kind)
+    if row is None:
+        return True
+    return row.next_attempt_at is not None and row.next_attempt_at <= (now or _now())
+
+
+def record_lookup(db: Session, cik: str, kind: str, found: bool, now: datetime = None):
+    """Records a lookup outcome and schedules the next attempt, in the caller's transaction."""
+    now = now or _now()
+    row = _attempt(db, cik, kind)
+    if row is None:
+        row = LookupAttempt(cik=cik, kind=kind, attempts=0, consecutive_misses=0)
+        db.add(row)
+    row.attempts += 1
+    row.last_attempt_at = now
+    if found:
+        row.last_outcome = "found"
+        row.consecutive_misses = 0
+        row.next_attempt_at = None
+    else:
+        row.last_outcome = "not_found"
+        row.consecutive_misses += 1
+        row.next_attempt_at = now + retry_delay(row.consecutive_misses)
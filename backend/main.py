@@ -1,10 +1,22 @@
-from fastapi import FastAPI, Depends, BackgroundTasks, HTTPException
+import importlib.util
+from datetime import date, timedelta
+from typing import List
+from fastapi import FastAPI, Depends, BackgroundTasks, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from .models import Base, engine, SessionLocal, Company
+from fastapi.responses import StreamingResponse
+from anyio import CapacityLimiter, to_thread
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .models import Base, engine, async_engine, SessionLocal, AsyncSessionLocal, Company, EntityMember, IngestionTrace
 from .ingestion import ingest_filings
 from .enrichment import enrich_company_profile, enrich_pending_companies
+from .export import EXPORT_FORMATS, stream_export
+from .schemas import CompanyOut, IngestionTraceOut, serialize_companies, serialize_company_clusters
+from .cache import bump_data_version, cache_key, cached_json_response, ensure_data_version
 from .config import EXCLUDED_INDUSTRIES
-from sqlalchemy.orm import Session
+from .metrics import QUEUE_DEPTH
+from .profiling import new_run_id, profile_path
 
 app = FastAPI(title="Startup Discovery API") 
 
@@ -19,50 +31,103 @@ app.add_middleware(
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
-
-def get_db():
     db = SessionLocal()
     try:
-        yield db
+        ensure_data_version(db)
     finally:
         db.close()
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    await async_engine.dispose()
+
+# Ingestion is sync and long-running; it gets its own thread so it never
+# occupies the shared threadpool, and concurrent /ingest calls queue up.
+ingest_limiter = CapacityLimiter(1)
+QUEUE_DEPTH.labels("ingest_requests").set_function(
+    lambda: ingest_limiter.statistics().tasks_waiting
+)
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_company_or_404(db: AsyncSession, company_id: int) -> Company:
+    company = await db.get(Company, company_id)
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return company
+
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Welcome to Startup Discovery API"}
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage latencies, outbound requests, queue depths and cache hit rates."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 @app.post("/ingest")
-def trigger_ingest(limit: int = 10, background_tasks: BackgroundTasks = None):
-    """Trigger ingestion of latest Form D filings and auto-enrich."""
-    count = ingest_filings(limit=limit)
+async def trigger_ingest(limit: int = 10, profile: bool = False, background_tasks: BackgroundTasks = None):
+    """
+    Trigger ingestion of latest Form D filings and auto-enrich.
+    With profile=true the run is profiled with cProfile; per-filing stage
+    timings are always recorded (see /ingestion/slow-companies).
+    """
+    run_id = new_run_id()
+    count = await to_thread.run_sync(ingest_filings, limit, profile, run_id, limiter=ingest_limiter)
     
     # Automatically trigger AI enrichment for new companies
     if background_tasks and count > 0:
         background_tasks.add_task(enrich_pending_companies)
     
-    return {"message": f"Ingested {count} filings", "enrichment_triggered": count > 0}
+    response = {"message": f"Ingested {count} filings", "enrichment_triggered": count > 0, "run_id": run_id}
+    if profile:
+        response["profile_path"] = profile_path(run_id)
+    return response
+
+@app.get("/ingestion/slow-companies", response_model=List[IngestionTraceOut])
+async def get_slow_companies(
+    limit: int = 20,
+    run_id: str = None,
+    cik: str = None,
+    min_seconds: float = None,
+    include_profile: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """Slowest ingested filings with their per-stage timings, slowest first."""
+    query = select(IngestionTrace)
+    if run_id:
+        query = query.filter(IngestionTrace.run_id == run_id)
+    if cik:
+        query = query.filter(IngestionTrace.cik == cik)
+    if min_seconds is not None:
+        query = query.filter(IngestionTrace.total_seconds >= min_seconds)
+    result = await db.scalars(query.order_by(IngestionTrace.total_seconds.desc()).limit(limit))
+    traces = [IngestionTraceOut.model_validate(trace) for trace in result.all()]
+    if not include_profile:
+        for trace in traces:
+            trace.profile = None
+    return traces
 
 @app.post("/companies/{company_id}/enrich")
-def trigger_enrichment(company_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def trigger_enrichment(company_id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
     """Trigger AI enrichment for a specific company."""
-    company = db.query(Company).filter(Company.id == company_id).first()
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
+    company = await get_company_or_404(db, company_id)
     
     # Reset status to pending if it was failed
     if company.enrichment_status == "failed":
         company.enrichment_status = "pending"
-        db.commit()
+        await db.run_sync(bump_data_version)
+        await db.commit()
     
     background_tasks.add_task(enrich_company_profile, company_id)
     return {"status": "processing", "company_id": company_id}
 
 @app.get("/companies/{company_id}/enrichment-status")
-def get_enrichment_status(company_id: int, db: Session = Depends(get_db)):
+async def get_enrichment_status(company_id: int, db: AsyncSession = Depends(get_db)):
     """Get enrichment status for a specific company."""
-    company = db.query(Company).filter(Company.id == company_id).first()
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
+    company = await get_company_or_404(db, company_id)
     
     return {
         "company_id": company_id,
@@ -70,43 +135,135 @@ def get_enrichment_status(company_id: int, db: Session = Depends(get_db)):
     }
 
 @app.post("/enrich-all")
-def trigger_enrich_all(background_tasks: BackgroundTasks):
+async def trigger_enrich_all(background_tasks: BackgroundTasks):
     """Trigger AI enrichment for all pending companies."""
     background_tasks.add_task(enrich_pending_companies)
     return {"status": "processing", "message": "Enrichment started for all pending companies"}
 
-@app.get("/companies")
-def get_companies(
-    industry: str = None, 
-    city: str = None, 
-    state: str = None, 
+def company_filters(
+    industry: str = None,
+    city: str = None,
+    state: str = None,
     revenue_range: str = None,
     founded_year: str = None,
-    limit: int = 100,
     days_ago: int = None,
     startup_mode: bool = False,
-    db: Session = Depends(get_db)
-):
-    query = db.query(Company)
-    
-    if industry:
-        query = query.filter(Company.industry == industry)
-    if city:
-        query = query.filter(Company.city == city)
-    if state:
-        query = query.filter(Company.state == state)
-    if revenue_range:
-        query = query.filter(Company.revenue_range == revenue_range)
-    if founded_year:
-        query = query.filter(Company.founded_year == founded_year)
-
-    if startup_mode:
+) -> dict:
+    """Filter parameters shared by the list and export endpoints."""
+    return {
+        "industry": industry,
+        "city": city,
+        "state": state,
+        "revenue_range": revenue_range,
+        "founded_year": founded_year,
+        "days_ago": days_ago,
+        "startup_mode": startup_mode,
+    }
+
+def apply_company_filters(query, filters: dict):
+    """Applies `filters` to a select(Company) (or legacy Query) and orders newest first."""
+    if filters["industry"]:
+        query = query.filter(Company.industry == filters["industry"])
+    if filters["city"]:
+        query = query.filter(Company.city == filters["city"])
+    if filters["state"]:
+        query = query.filter(Company.state == filters["state"])
+    if filters["revenue_range"]:
+        query = query.filter(Company.revenue_range == filters["revenue_range"])
+    if filters["founded_year"]:
+        query = query.filter(Company.founded_year == filters["founded_year"])
+
+    if filters["startup_mode"]:
         query = query.filter(Company.industry.notin_(EXCLUDED_INDUSTRIES))
     
-    if days_ago is not None:
-        from datetime import date, timedelta
-        date_threshold = date.today() - timedelta(days=days_ago)
+    if filters["days_ago"] is not None:
+        date_threshold = date.today() - timedelta(days=filters["days_ago"])
         query = query.filter(Company.latest_filing_date >= date_threshold)
-        
-    companies = query.order_by(Company.latest_filing_date.desc()).limit(limit).all()
-    return companies
+
+    return query.order_by(Company.latest_filing_date.desc())
+
+def collapsed_companies(filters: dict, limit: int):
+    """
+    One row per entity cluster (backend.entities): its member with the latest
+    filing among those matching the filters, with the cluster id and the number
+    of matching members. Companies not resolved yet are their own cluster.
+    """
+    cluster_id = func.coalesce(EntityMember.cluster_id, Company.id)
+    ranked = apply_company_filters(
+        select(
+            Company.id.label("company_id"),
+            cluster_id.label("cluster_id"),
+            func.row_number().over(
+                partition_by=cluster_id,
+                order_by=(Company.latest_filing_date.desc(), Company.id.desc()),
+            ).label("rank"),
+            func.count().over(partition_by=cluster_id).label("cluster_size"),
+        ).outerjoin(EntityMember, EntityMember.company_id == Company.id),
+        filters,
+    ).subquery()
+    return (
+        select(Company, ranked.c.cluster_id, ranked.c.cluster_size)
+        .join(ranked, ranked.c.company_id == Company.id)
+        .where(ranked.c.rank == 1)
+        .order_by(Company.latest_filing_date.desc())
+        .limit(limit)
+    )
+
+@app.get("/companies", response_model=List[CompanyOut])
+async def get_companies(
+    request: Request,
+    limit: int = 100,
+    collapse_related: bool = False,
+    filters: dict = Depends(company_filters),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Companies matching the filters, newest filing first. With collapse_related=true,
+    related entities (SPVs, numbered funds, name variants) are returned as one row
+    per cluster, with extra `cluster_id` and `cluster_size` fields.
+    """
+    # days_ago is relative to today, so the same parameters mean a new result tomorrow
+    as_of = date.today() if filters["days_ago"] is not None else None
+    key = cache_key("companies", limit=limit, as_of=as_of, collapse_related=collapse_related, **filters)
+
+    async def render() -> bytes:
+        if collapse_related:
+            result = await db.execute(collapsed_companies(filters, limit))
+            return serialize_company_clusters(result.all())
+        result = await db.scalars(apply_company_filters(select(Company), filters).limit(limit))
+        return serialize_companies(result.all())
+
+    return await cached_json_response(request, db, key, render)
+
+@app.get("/companies/{company_id}/related", response_model=List[CompanyOut])
+async def get_related_companies(company_id: int, db: AsyncSession = Depends(get_db)):
+    """Other companies resolved to the same entity cluster, newest filing first."""
+    await get_company_or_404(db, company_id)
+    cluster_id = select(EntityMember.cluster_id).where(EntityMember.company_id == company_id).scalar_subquery()
+    result = await db.scalars(
+        select(Company)
+        .join(EntityMember, EntityMember.company_id == Company.id)
+        .where(EntityMember.cluster_id == cluster_id, Company.id != company_id)
+        .order_by(Company.latest_filing_date.desc())
+    )
+    return Response(serialize_companies(result.all()), media_type="application/json")
+
+@app.get("/companies/export")
+async def export_companies(
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    limit: int = None,
+    filters: dict = Depends(company_filters),
+):
+    """Stream all companies matching the filters as NDJSON, CSV or Parquet."""
+    if format == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow to be installed")
+
+    stmt = apply_company_filters(select(Company), filters)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return StreamingResponse(
+        stream_export(format, stmt),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="companies.{format}"'},
+    )
@@ -0,0 +1,118 @@
+"""
+Prometheus metrics for ingestion, enrichment and the API, served at GET /metrics.
+Pipeline stages are timed with `stage()` (as a context manager or decorator),
+outbound HTTP calls are counted by host and outcome with `record_request()`,
+and queue depths / cache and SEC throttle statistics are read at scrape time.
+"""
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from sec_downloader import RequestEvent, RequestHooks
+
+from .profiling import add_to_trace
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "pipeline_stage_seconds",
+    "Time spent in each ingestion/enrichment stage",
+    ["stage", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+EXTERNAL_REQUESTS = Counter(
+    "external_requests_total",
+    "Outbound HTTP requests by host and outcome (2xx/3xx/4xx/5xx/error)",
+    ["host", "outcome"],
+)
+QUEUE_DEPTH = Gauge(
+    "pipeline_queue_depth",
+    "Items waiting to be processed, per queue",
+    ["queue"],
+)
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Times a stage; the outcome label is "error" when it raises. The time is
+    also added to the current ingestion trace, if any.
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(name, outcome).observe(elapsed)
+        add_to_trace(name, elapsed)
+
+
+def status_outcome(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def record_request(url_or_host: str, outcome: str):
+    host = urlparse(url_or_host).netloc if "://" in url_or_host else url_or_host
+    EXTERNAL_REQUESTS.labels(host.lower() or "unknown", outcome).inc()
+
+
+class SecRequestMetrics(RequestHooks):
+    """Downloader hook that counts SEC requests like every other outbound call."""
+
+    def on_request_end(self, event: RequestEvent):
+        record_request(
+            event.url,
+            "error" if event.status is None else status_outcome(event.status),
+        )
+
+
+class RuntimeCollector:
+    """Reads counters kept elsewhere (result cache, SEC throttle, host health) at scrape time."""
+
+    def collect(self):
+        # Imported lazily so importing metrics never pulls in the whole app
+        from sec_downloader.throttle import sec_rate_controller
+        from .cache import result_cache
+        from .host_health import host_health
+
+        cache = CounterMetricFamily(
+            "api_result_cache_lookups",
+            "In-process result cache lookups for read endpoints",
+            labels=["result"],
+        )
+        cache.add_metric(["hit"], result_cache.hits)
+        cache.add_metric(["miss"], result_cache.misses)
+        yield cache
+
+        stats = sec_rate_controller.stats()
+        yield GaugeMetricFamily(
+            "sec_rate_limit_requests_per_second",
+            "Request rate currently allowed by the adaptive SEC throttle",
+            value=stats["current_rate"],
+        )
+        for name, help_text in (
+            ("requests", "Requests paced by the SEC throttle"),
+            ("throttled", "SEC responses with 429/503"),
+            ("retries", "Retried SEC requests"),
+        ):
+            yield CounterMetricFamily(f"sec_{name}", help_text, value=stats[name])
+
+        fast_failures = CounterMetricFamily(
+            "host_fast_failures",
+            "Requests refused without being sent: host does not resolve or its circuit is open",
+            labels=["reason"],
+        )
+        for reason, count in host_health.fast_failures.items():
+            fast_failures.add_metric([reason], count)
+        yield fast_failures
+        yield CounterMetricFamily("host_dns_lookups", "DNS lookups made by the host health cache", value=host_health.dns_lookups)
+        yield GaugeMetricFamily("host_open_circuits", "Hosts currently failing fast after repeated failures", value=host_health.open_circuits())
+
+
+REGISTRY.register(RuntimeCollector())
@@ -1,12 +1,18 @@
-from sqlalchemy import Column, Integer, String, Date, create_engine
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from .config import DATABASE_URL
+from .storage import create_storage_engine, create_async_storage_engine
 
-DATABASE_URL = "sqlite:///./companies.db"
-
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Sync engine for scripts, ingestion and enrichment workers
+engine = create_storage_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the API
+async_engine = create_async_storage_engine(DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 class Company(Base):
@@ -40,3 +46,125 @@ class Company(Base):
     # AI Enrichment Status
     enrichment_status = Column(String, default="pending")  # pending, processing, completed, failed
 
+
+class DataVersion(Base):
+    """
+    Single-row counter bumped by every write that changes API-visible data.
+    Read endpoints derive ETags and cache validity from it.
+    """
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class ArchivedFiling(Base):
+    """
+    Raw primary document of an ingested filing, kept in the local filing archive
+    (see backend.archive) so fields can be re-derived without downloading it again.
+    """
+    __tablename__ = "archived_filings"
+
+    accession_number = Column(String, primary_key=True)
+    cik = Column(String, index=True, nullable=False)
+    form_type = Column(String)
+    filing_date = Column(Date)
+    content_hash = Column(String, nullable=False)  # sha256 of the uncompressed document
+    size = Column(Integer)  # uncompressed bytes
+    archived_at = Column(DateTime, nullable=False)
+
+
+class LookupAttempt(Base):
+    """
+    Latest website/careers discovery attempt for a company (see backend.lookups).
+    Misses are retried with exponential backoff instead of on every ingest.
+    """
+    __tablename__ = "lookup_attempts"
+
+    cik = Column(String, primary_key=True)
+    kind = Column(String, primary_key=True)  # website, careers
+    attempts = Column(Integer, nullable=False, default=0)
+    consecutive_misses = Column(Integer, nullable=False, default=0)
+    last_outcome = Column(String)  # found, not_found
+    last_attempt_at = Column(DateTime, nullable=False)
+    next_attempt_at = Column(DateTime, index=True)  # None once found
+
+
+class LinkCheck(Base):
+    """
+    Liveness schedule of a company's website or careers URL (see backend.link_monitor).
+    The recheck interval grows while the status is stable and resets when it changes.
+    """
+    __tablename__ = "link_checks"
+
+    company_id = Column(Integer, primary_key=True)
+    kind = Column(String, primary_key=True)  # website, careers
+    url = Column(String, nullable=False)
+    status = Column(String)  # Active, Broken, Unreachable; None until first checked
+    http_status = Column(Integer)
+    interval_hours = Column(Float, nullable=False)
+    last_checked_at = Column(DateTime)
+    last_changed_at = Column(DateTime)
+    next_check_at = Column(DateTime, index=True, nullable=False)
+
+
+class JobCheckpoint(Base):
+    """
+    Progress of a resumable batch job over companies in id order (e.g.
+    backend.reverify_websites). A killed run resumes after `last_company_id`.
+    """
+    __tablename__ = "job_checkpoints"
+
+    name = Column(String, primary_key=True)
+    scope = Column(String)  # JSON: the selection the run was started with
+    last_company_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+
+
+class IngestionTrace(Base):
+    """
+    Stage timings of one feed entry in an ingestion run (see backend.profiling),
+    with the entry's cProfile summary when the run was profiled.
+    """
+    __tablename__ = "ingestion_traces"
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(String, index=True, nullable=False)
+    link = Column(String)  # feed entry link (filing index page)
+    cik = Column(String, index=True)
+    accession_number = Column(String, index=True)
+    company_name = Column(String)
+    outcome = Column(String)  # added, updated, unchanged, skipped, error
+    total_seconds = Column(Float, index=True, nullable=False)
+    stage_seconds = Column(String)  # JSON: {stage: seconds}
+    profile = Column(Text)  # top functions by cumulative time, profiled runs only
+    created_at = Column(DateTime, nullable=False)
+
+
+class EntityMember(Base):
+    """
+    Cluster of related companies a company belongs to (see backend.entities):
+    name variants, SPVs and numbered funds filing under separate CIKs.
+    """
+    __tablename__ = "entity_members"
+
+    company_id = Column(Integer, primary_key=True)
+    cluster_id = Column(Integer, index=True, nullable=False)  # lowest company id in the cluster
+    normalized_name = Column(String, nullable=False)  # legal suffixes removed
+    core_name = Column(String, nullable=False)  # also fund/SPV/series markers removed; what is compared
+    state = Column(String)
+    match_score = Column(Float)  # similarity to the closest member when linked; None if it started the cluster
+
+
+class EntityKey(Base):
+    """Blocking index for entity resolution: companies sharing a key are compared."""
+    __tablename__ = "entity_keys"
+
+    key = Column(String, primary_key=True)
+    company_id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,134 @@
+"""
+Per-filing stage traces and optional cProfile profiles of ingestion runs.
+Every ingested feed entry gets an IngestionTrace row with the seconds spent in
+each `metrics.stage()` (plus rate-limit sleeps). In profile mode the entry is
+also run under cProfile; its hottest functions are stored on the trace and the
+whole run is written to PROFILE_DIR/ingest-<run_id>.prof for pstats/snakeviz.
+"""
+import contextvars
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from .config import PROFILE_DIR
+from .models import IngestionTrace
+
+# Functions kept per filing, sorted by cumulative time
+PROFILE_TOP_FUNCTIONS = 30
+
+_current_trace: contextvars.ContextVar[Optional["StageTrace"]] = contextvars.ContextVar(
+    "ingestion_stage_trace", default=None
+)
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def profile_path(run_id: str) -> str:
+    return os.path.join(PROFILE_DIR, f"ingest-{run_id}.prof")
+
+
+class StageTrace:
+    """
+    Seconds per stage for one feed entry. Stages nest (verification runs inside
+    website_search), so the per-stage values do not add up to `total_seconds`.
+    """
+
+    def __init__(self):
+        self.stages: dict[str, float] = {}
+        self.total_seconds = 0.0
+
+    def add(self, name: str, seconds: float):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+
+def add_to_trace(name: str, seconds: float):
+    """Called by metrics.stage(); a no-op outside traced_entry()."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, seconds)
+
+
+class RunProfiler:
+    """Profiles feed entries one at a time and merges them into a run profile."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.stats: Optional[pstats.Stats] = None
+        self.last_entry_text: Optional[str] = None
+
+    @contextmanager
+    def profile_entry(self):
+        """Profiles the block; its top functions are then in `last_entry_text`."""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            stream = io.StringIO()
+            entry_stats = pstats.Stats(profiler, stream=stream)
+            entry_stats.strip_dirs().sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+            self.last_entry_text = stream.getvalue()
+            if self.stats is None:
+                self.stats = pstats.Stats(profiler)
+            else:
+                self.stats.add(profiler)
+
+    def dump(self) -> Optional[str]:
+        """Writes the merged profile and returns its path."""
+        if self.stats is None:
+            return None
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = profile_path(self.run_id)
+        self.stats.dump_stats(path)
+        return path
+
+
+@contextmanager
+def traced_entry(db, run_id: str, link: str, profiler: Optional[RunProfiler] = None):
+    """
+    Traces one feed entry and adds its IngestionTrace to `db` (committed with
+    the run). The yielded dict may be filled with cik, accession_number,
+    company_name and outcome by the caller.
+    """
+    trace = StageTrace()
+    info = {"outcome": "skipped"}
+    token = _current_trace.set(trace)
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            with profiler.profile_entry():
+                yield info
+        else:
+            yield info
+    except BaseException:
+        info["outcome"] = "error"
+        raise
+    finally:
+        trace.total_seconds = time.perf_counter() - start
+        _current_trace.reset(token)
+        db.add(
+            IngestionTrace(
+                run_id=run_id,
+                link=link,
+                cik=info.get("cik"),
+                accession_number=info.get("accession_number"),
+                company_name=info.get("company_name"),
+                outcome=info["outcome"],
+                total_seconds=trace.total_seconds,
+                stage_seconds=json.dumps(
+                    {name: round(seconds, 4) for name, seconds in trace.stages.items()}
+                ),
+                profile=profiler.last_entry_text if profiler is not None else None,
+                created_at=datetime.utcnow(),
+            )
+        )
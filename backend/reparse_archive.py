@@ -0,0 +1,211 @@
+"""
+Re-runs parse_form_d over the local filing archive and bulk-updates companies.
+Each company is re-parsed from its most recent archived filing. Parsing runs in
+a process pool and reads only local files, so re-deriving fields after a parser
+change is CPU-bound instead of network-bound. Signals derived from re-parsed
+fields (maturity, funding, founders, design opportunity) are recomputed in the
+workers, and companies whose name changed are re-resolved into entity clusters.
+
+Usage:
+    python -m backend.reparse_archive
+    python -m backend.reparse_archive --workers 8 --batch-size 1000
+    python -m backend.reparse_archive --cik 0001234567 --dry-run
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select, update
+
+from .archive import FilingArchive
+from .cache import bump_data_version
+from .entities import reresolve_company
+from .ingestion import analyze_founders, analyze_funding, analyze_maturity, infer_design_opportunity, parse_form_d
+from .models import ArchivedFiling, Company, SessionLocal
+
+# Company column -> parse_form_d key
+PARSED_FIELDS = {
+    "name": "issuer_name",
+    "city": "city",
+    "state": "state",
+    "industry": "industry",
+    "founded_year": "founded_year",
+    "revenue_range": "revenue_range",
+    "amount_sold": "amount_sold",
+    "jurisdiction": "jurisdiction",
+    "executive_name": "executive_name",
+    "executive_title": "executive_title",
+}
+# Parsed columns the stored signals are derived from
+SIGNAL_INPUTS = {"founded_year", "industry", "revenue_range", "executive_name"}
+# Stored columns the signal recomputation reads
+SIGNAL_COLUMNS = (
+    "maturity_info",
+    "funding_details",
+    "founder_analysis",
+    "public_presence_quality",
+    "hiring_signal",
+    "design_opportunity",
+    "engagement_recommendation",
+    "enrichment_status",
+)
+
+
+def _parse_archived(task):
+    """
+    Worker: parses one archived document and derives the company's column changes.
+    Returns (company id, changes or None, error).
+    """
+    company_id, blob_path, current = task
+    try:
+        with gzip.open(blob_path, "rb") as f:
+            parsed = parse_form_d(f.read())
+        changes = changed_fields(current, parsed)
+        if SIGNAL_INPUTS & changes.keys():
+            changes.update(derived_changes(current, changes))
+        return company_id, changes, None
+    except Exception as e:
+        return company_id, None, str(e)
+
+
+def _decode(value) -> dict:
+    try:
+        decoded = json.loads(value) if value else {}
+    except ValueError:
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+def changed_fields(current: dict, parsed: dict) -> dict:
+    """
+    Columns whose re-parsed value differs from the stored one.
+    Values the parser could not find ("Unknown"/None) never overwrite stored data.
+    """
+    changes = {}
+    for column, key in PARSED_FIELDS.items():
+        value = parsed.get(key)
+        if value in (None, "", "Unknown"):
+            continue
+        if value != current[column]:
+            changes[column] = value
+    return changes
+
+
+def derived_changes(current: dict, changes: dict) -> dict:
+    """
+    Signal columns recomputed from the updated parsed fields, the way ingestion
+    derives them. AI-enriched keys are kept, as is the AI engagement
+    recommendation once enrichment completed. Only changed columns are returned.
+    """
+    fields = {**current, **changes}
+    maturity = {**_decode(current["maturity_info"]), **analyze_maturity(fields["founded_year"])}
+    funding = {
+        **_decode(current["funding_details"]),
+        **analyze_funding({"industry": fields["industry"] or "", "revenue_range": fields["revenue_range"] or ""}),
+    }
+    founders = {**_decode(current["founder_analysis"]), **analyze_founders(fields["executive_name"])}
+    inferred = infer_design_opportunity(
+        maturity,
+        funding,
+        founders,
+        _decode(current["public_presence_quality"]),
+        _decode(current["hiring_signal"]),
+    )
+    derived = {
+        "maturity_info": json.dumps(maturity),
+        "funding_details": json.dumps(funding),
+        "founder_analysis": json.dumps(founders),
+        "design_opportunity": json.dumps({**_decode(current["design_opportunity"]), **inferred["design_opportunity"]}),
+    }
+    if current["enrichment_status"] != "completed":
+        derived["engagement_recommendation"] = inferred["engagement_recommendation"]
+    return {column: value for column, value in derived.items() if value != current[column]}
+
+
+def select_tasks(db, archive: FilingArchive, ciks=None):
+    """(company id, blob path, current values) for the latest archived filing of each company."""
+    columns = [getattr(Company, column) for column in (*PARSED_FIELDS, *SIGNAL_COLUMNS)]
+    stmt = (
+        select(Company.id, ArchivedFiling.content_hash, *columns)
+        .join(ArchivedFiling, ArchivedFiling.cik == Company.cik)
+        .order_by(Company.id, ArchivedFiling.filing_date.desc(), ArchivedFiling.accession_number.desc())
+    )
+    if ciks:
+        stmt = stmt.where(Company.cik.in_(ciks))
+
+    tasks = []
+    queued = set()
+    for row in db.execute(stmt):
+        if row.id in queued:
+            continue  # an older filing of a company already queued
+        queued.add(row.id)
+        current = {column: getattr(row, column) for column in (*PARSED_FIELDS, *SIGNAL_COLUMNS)}
+        tasks.append((row.id, str(archive.blob_path(row.content_hash)), current))
+    return tasks
+
+
+def reparse_archive(workers: int = None, batch_size: int = 500, ciks=None, dry_run: bool = False, archive: FilingArchive = None) -> dict:
+    archive = archive or FilingArchive()
+    db = SessionLocal()
+    stats = {"parsed": 0, "updated": 0, "failed": 0}
+    pending = []
+
+    def flush():
+        if pending and not dry_run:
+            # Bulk UPDATE by primary key: one executemany per batch
+            db.execute(update(Company), pending)
+            # Names feed entity resolution; re-link the renamed companies
+            for change in pending:
+                if "name" in change:
+                    reresolve_company(db, db.get(Company, change["id"]))
+            bump_data_version(db)
+            db.commit()
+        stats["updated"] += len(pending)
+        pending.clear()
+
+    try:
+        tasks = select_tasks(db, archive, ciks)
+        # Release the read transaction while the workers parse
+        db.commit()
+        print(f"Re-parsing {len(tasks)} archived filings with {workers or os.cpu_count()} workers...")
+
+        chunksize = max(1, min(64, len(tasks) // ((workers or os.cpu_count() or 1) * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for company_id, changes, error in pool.map(_parse_archived, tasks, chunksize=chunksize):
+                if error is not None:
+                    print(f"Failed to re-parse company {company_id}: {error}")
+                    stats["failed"] += 1
+                    continue
+                stats["parsed"] += 1
+                if changes:
+                    pending.append({"id": company_id, **changes})
+                if len(pending) >= batch_size:
+                    flush()
+        flush()
+    finally:
+        db.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Companies per bulk UPDATE")
+    parser.add_argument("--cik", action="append", help="Only re-parse these CIKs (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = reparse_archive(args.workers, args.batch_size, args.cik, args.dry_run)
+    verb = "would update" if args.dry_run else "updated"
+    print(
+        f"Parsed {stats['parsed']} filings, {verb} {stats['updated']} companies, "
+        f"{stats['failed']} failures in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
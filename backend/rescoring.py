@@ -0,0 +1,219 @@
+"""
+Nightly rescoring of the time-dependent intelligence signals.
+analyze_maturity (age, stage) and analyze_hiring_signal ("Deferring" until 90
+days after the filing, then "Stalled") depend on today's date, and
+infer_design_opportunity depends on both, but ingestion stores them once.
+This job recomputes them for every company from the stored columns and writes
+back only rows whose signals changed.
+
+The signals take few distinct inputs (founded year, filing date, a handful of
+stages and statuses), so each rule runs once per distinct input per pass and
+rows are scored by dictionary lookups; companies are read column-wise in
+keyset pages and written with one bulk UPDATE per page.
+AI-enriched keys of design_opportunity are kept, and the AI engagement
+recommendation is not replaced once enrichment has completed.
+
+Usage:
+    python -m backend.rescoring
+    python -m backend.rescoring --batch-size 50000 --dry-run
+"""
+import argparse
+import json
+import time
+from typing import Optional
+
+import orjson
+from sqlalchemy import select, update
+
+from .cache import bump_data_version
+from .ingestion import analyze_hiring_signal, analyze_maturity, infer_design_opportunity
+from .models import Company, SessionLocal
+
+DEFAULT_BATCH_SIZE = 20000
+# Distinct input combinations remembered per pass; AI-enriched design_opportunity
+# text is unique per company, so the memos are bounded
+MEMO_MAX = 200_000
+INPUT_COLUMNS = (
+    "id",
+    "founded_year",
+    "latest_filing_date",
+    "careers_url",
+    "maturity_info",
+    "funding_details",
+    "public_presence_quality",
+    "hiring_signal",
+    "design_opportunity",
+    "engagement_recommendation",
+    "enrichment_status",
+)
+
+
+def _loads(value) -> dict:
+    if not value:
+        return {}
+    try:
+        decoded = orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return {}
+    return decoded if isinstance(decoded, dict) else {}
+
+
+class Scorer:
+    """
+    Memoized signal rules for one rescoring pass ("today" is fixed per pass).
+    Rows with the same stored inputs share one evaluation, so a pass costs a
+    few dictionary lookups per row plus one rule evaluation per distinct input.
+    """
+
+    def __init__(self):
+        self._maturity = {}
+        self._hiring = {}
+        self._opportunity = {}
+        self._signals = {}
+        self._merged = {}
+
+    def maturity(self, founded_year) -> dict:
+        result = self._maturity.get(founded_year)
+        if result is None:
+            result = self._maturity[founded_year] = analyze_maturity(founded_year)
+        return result
+
+    def hiring(self, has_live_careers: bool, latest_filing_date) -> dict:
+        key = (has_live_careers, latest_filing_date)
+        result = self._hiring.get(key)
+        if result is None:
+            # Only the truthiness of the careers URL matters to the rule
+            result = self._hiring[key] = analyze_hiring_signal(
+                "careers" if has_live_careers else None, latest_filing_date
+            )
+        return result
+
+    def opportunity(self, maturity: dict, funding: dict, presence: dict, hiring: dict) -> tuple:
+        """(input key, infer_design_opportunity result) for exactly the inputs the rule reads."""
+        key = (
+            maturity.get("stage", "Unknown"),
+            maturity.get("is_early_stage", False),
+            tuple(funding.get("bottlenecks") or ()),
+            presence.get("website_status"),
+            presence.get("quality_score"),
+            hiring.get("hiring_velocity"),
+        )
+        result = self._opportunity.get(key)
+        if result is None:
+            stage, is_early, bottlenecks, website_status, quality_score, velocity = key
+            result = self._opportunity[key] = infer_design_opportunity(
+                {"stage": stage, "is_early_stage": is_early},
+                {"bottlenecks": list(bottlenecks)},
+                {},
+                {"website_status": website_status, "quality_score": quality_score},
+                {"hiring_velocity": velocity},
+            )
+        return key, result
+
+    def signals(self, founded_year, latest_filing_date, has_careers, maturity_info, funding_details, presence_quality, hiring_signal) -> tuple:
+        """
+        (new maturity JSON or None, new hiring JSON or None, opportunity key, inferred)
+        for one combination of stored inputs.
+        """
+        key = (founded_year, latest_filing_date, has_careers, maturity_info, funding_details, presence_quality, hiring_signal)
+        result = self._signals.get(key)
+        if result is not None:
+            return result
+        if len(self._signals) >= MEMO_MAX:
+            self._signals.clear()
+
+        stored_maturity = _loads(maturity_info)
+        maturity = {**stored_maturity, **self.maturity(founded_year)}
+        stored_hiring = _loads(hiring_signal)
+        # The link monitor marks careers pages that stopped responding
+        has_live_careers = has_careers and stored_hiring.get("careers_page_status", "Active") == "Active"
+        hiring = {**stored_hiring, **self.hiring(has_live_careers, latest_filing_date)}
+        opportunity_key, inferred = self.opportunity(maturity, _loads(funding_details), _loads(presence_quality), hiring)
+
+        result = self._signals[key] = (
+            json.dumps(maturity) if maturity != stored_maturity else None,
+            json.dumps(hiring) if hiring != stored_hiring else None,
+            opportunity_key,
+            inferred,
+        )
+        return result
+
+    def merged_opportunity(self, design_opportunity, opportunity_key, inferred) -> Optional[str]:
+        """New design_opportunity JSON keeping any AI keys, or None when unchanged."""
+        key = (design_opportunity, opportunity_key)
+        if key in self._merged:
+            return self._merged[key]
+        if len(self._merged) >= MEMO_MAX:
+            self._merged.clear()
+        stored = _loads(design_opportunity)
+        merged = {**stored, **inferred["design_opportunity"]}
+        result = self._merged[key] = json.dumps(merged) if merged != stored else None
+        return result
+
+    def rescore(self, row) -> Optional[dict]:
+        """Changed columns of one company (with its id), or None when nothing changed."""
+        (company_id, founded_year, latest_filing_date, careers_url, maturity_info, funding_details,
+         presence_quality, hiring_signal, design_opportunity, recommendation, enrichment_status) = row
+        maturity_json, hiring_json, opportunity_key, inferred = self.signals(
+            founded_year, latest_filing_date, bool(careers_url), maturity_info, funding_details, presence_quality, hiring_signal
+        )
+        opportunity_json = self.merged_opportunity(design_opportunity, opportunity_key, inferred)
+
+        changes = {}
+        if maturity_json is not None:
+            changes["maturity_info"] = maturity_json
+        if hiring_json is not None:
+            changes["hiring_signal"] = hiring_json
+        if opportunity_json is not None:
+            changes["design_opportunity"] = opportunity_json
+        if enrichment_status != "completed" and inferred["engagement_recommendation"] != recommendation:
+            changes["engagement_recommendation"] = inferred["engagement_recommendation"]
+        if not changes:
+            return None
+        changes["id"] = company_id
+        return changes
+
+
+def rescore_companies(batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False, session_factory=SessionLocal) -> dict:
+    scorer = Scorer()
+    stats = {"scanned": 0, "updated": 0}
+    table = Company.__table__
+    columns = [table.c[column] for column in INPUT_COLUMNS]
+    db = session_factory()
+    try:
+        cursor = 0
+        while True:
+            # Plain tuples through Core; the ORM row machinery is not needed here
+            rows = db.connection().execute(
+                select(*columns).where(table.c.id > cursor).order_by(table.c.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            cursor = rows[-1][0]
+            pending = [changes for changes in map(scorer.rescore, rows) if changes is not None]
+            stats["scanned"] += len(rows)
+            stats["updated"] += len(pending)
+            if pending and not dry_run:
+                # Bulk UPDATE by primary key: one executemany per page
+                db.execute(update(Company), pending)
+                bump_data_version(db)
+            db.commit()
+    finally:
+        db.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Companies per page and bulk UPDATE")
+    parser.add_argument("--dry-run", action="store_true", help="Count changes without writing them")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = rescore_companies(args.batch_size, args.dry_run)
+    verb = "would update" if args.dry_run else "updated"
+    print(f"Rescored {stats['scanned']} companies, {verb} {stats['updated']} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
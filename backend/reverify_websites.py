@@ -0,0 +1,236 @@
+"""
+Re-verifies company websites, public presence and careers pages in bulk.
+Companies are processed in id order, in batches, by a pool of worker threads
+that share the per-host limits of backend.host_limits. Each batch is written
+with one bulk UPDATE together with its checkpoint, so a killed run resumes
+after the last committed batch (re-run with the same --job name).
+
+A search that finds no website keeps the stored URL unless --clear-missing is
+given, since a failed or throttled search looks the same as "no website".
+
+Usage:
+    python -m backend.reverify_websites --stale-days 30
+    python -m backend.reverify_websites --failed --workers 16 --max-companies 5000
+    python -m backend.reverify_websites --id 12 --id 40 --job fix-ids
+    python -m backend.reverify_websites --name "%EPEP IV%" --clear-missing
+    python -m backend.reverify_websites --all --restart
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, update
+
+from .cache import bump_data_version
+from .ingestion import analyze_public_presence, get_careers_url, get_company_url
+from .lookups import CAREERS, WEBSITE, record_lookup
+from .models import Base, Company, JobCheckpoint, LookupAttempt, SessionLocal, engine
+
+DEFAULT_JOB_NAME = "reverify-websites"
+SELECTED_COLUMNS = ("id", "cik", "name", "city", "state", "website_url", "careers_url", "public_presence_quality")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def build_scope(ids=None, name=None, stale_days=None, failed=False) -> dict:
+    scope = {"ids": ids or None, "name": name, "failed": failed, "stale_before": None}
+    if stale_days is not None:
+        # Fixed at the start so a resumed run selects the same companies
+        scope["stale_before"] = (_now() - timedelta(days=stale_days)).isoformat()
+    return scope
+
+
+def scope_filter(stmt, scope: dict):
+    """Applies a scope from build_scope() to a select over Company; criteria combine with AND."""
+    if scope.get("ids"):
+        stmt = stmt.where(Company.id.in_(scope["ids"]))
+    if scope.get("name"):
+        stmt = stmt.where(Company.name.ilike(scope["name"]))
+    if scope.get("failed"):
+        stmt = stmt.where(
+            or_(
+                Company.website_url.is_(None),
+                Company.public_presence_quality.like('%"website_status": "Unreachable"%'),
+            )
+        )
+    if scope.get("stale_before"):
+        # Never checked, or last checked before the cutoff
+        stmt = stmt.outerjoin(
+            LookupAttempt,
+            and_(LookupAttempt.cik == Company.cik, LookupAttempt.kind == WEBSITE),
+        ).where(
+            or_(
+                LookupAttempt.last_attempt_at.is_(None),
+                LookupAttempt.last_attempt_at < datetime.fromisoformat(scope["stale_before"]),
+            )
+        )
+    return stmt
+
+
+def reverify_company(row: dict, clear_missing: bool = False) -> dict:
+    """Worker: runs discovery for one company. Returns its column changes and lookup outcomes."""
+    try:
+        found_website = get_company_url(row["name"], row["city"], row["state"])
+        website_url = found_website or (None if clear_missing else row["website_url"])
+        careers_url = get_careers_url(row["name"], website_url)
+        presence = json.dumps(analyze_public_presence(website_url))
+    except Exception as e:
+        return {"id": row["id"], "error": str(e)}
+
+    changes = {}
+    if website_url != row["website_url"]:
+        changes["website_url"] = website_url
+    if careers_url and careers_url != row["careers_url"]:
+        changes["careers_url"] = careers_url
+    if presence != row["public_presence_quality"]:
+        changes["public_presence_quality"] = presence
+    return {
+        "id": row["id"],
+        "cik": row["cik"],
+        "changes": changes,
+        "website_found": bool(found_website),
+        "careers_found": bool(careers_url),
+    }
+
+
+def load_checkpoint(db, job: str, scope: dict, restart: bool) -> JobCheckpoint:
+    checkpoint = db.get(JobCheckpoint, job)
+    if checkpoint is not None and checkpoint.finished_at is None and not restart:
+        print(
+            f"Resuming job {job!r} after company {checkpoint.last_company_id} "
+            f"({checkpoint.processed} done) with its original scope {checkpoint.scope}"
+        )
+        return checkpoint
+    now = _now()
+    checkpoint = db.merge(
+        JobCheckpoint(
+            name=job,
+            scope=json.dumps(scope),
+            last_company_id=0,
+            processed=0,
+            updated=0,
+            failed=0,
+            started_at=now,
+            updated_at=now,
+            finished_at=None,
+        )
+    )
+    db.commit()
+    return checkpoint
+
+
+def reverify_websites(
+    scope: dict,
+    job: str = DEFAULT_JOB_NAME,
+    workers: int = 8,
+    batch_size: int = 100,
+    max_companies: int = None,
+    clear_missing: bool = False,
+    restart: bool = False,
+    dry_run: bool = False,
+) -> dict:
+    db = SessionLocal()
+    stats = {"processed": 0, "updated": 0, "failed": 0}
+    try:
+        checkpoint = load_checkpoint(db, job, scope, restart) if not dry_run else None
+        if checkpoint is not None:
+            scope = json.loads(checkpoint.scope)
+        cursor = checkpoint.last_company_id if checkpoint is not None else 0
+        columns = [getattr(Company, column) for column in SELECTED_COLUMNS]
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while max_companies is None or stats["processed"] < max_companies:
+                size = batch_size if max_companies is None else min(batch_size, max_companies - stats["processed"])
+                stmt = scope_filter(select(*columns), scope).where(Company.id > cursor).order_by(Company.id).limit(size)
+                rows = [dict(row._mapping) for row in db.execute(stmt)]
+                # Release the read transaction while the workers run
+                db.commit()
+                if not rows:
+                    if checkpoint is not None:
+                        checkpoint.finished_at = _now()
+                        db.commit()
+                    break
+
+                results = list(pool.map(lambda row: reverify_company(row, clear_missing), rows))
+                pending = []
+                failed = 0
+                for result in results:
+                    if "error" in result:
+                        print(f"Failed to re-verify company {result['id']}: {result['error']}")
+                        failed += 1
+                        continue
+                    if result["changes"]:
+                        pending.append({"id": result["id"], **result["changes"]})
+                    if not dry_run:
+                        record_lookup(db, result["cik"], WEBSITE, result["website_found"])
+                        record_lookup(db, result["cik"], CAREERS, result["careers_found"])
+
+                cursor = rows[-1]["id"]
+                stats["processed"] += len(rows)
+                stats["updated"] += len(pending)
+                stats["failed"] += failed
+                if dry_run:
+                    for change in pending:
+                        print(f"  would update {change}")
+                    continue
+
+                # Bulk UPDATE by primary key, committed with the checkpoint
+                if pending:
+                    db.execute(update(Company), pending)
+                    bump_data_version(db)
+                checkpoint.last_company_id = cursor
+                checkpoint.processed += len(rows)
+                checkpoint.updated += len(pending)
+                checkpoint.failed += failed
+                checkpoint.updated_at = _now()
+                db.commit()
+                print(f"Checked {checkpoint.processed} companies (through id {cursor}), {checkpoint.updated} updated")
+    finally:
+        db.close()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--id", type=int, action="append", help="Only these company ids (repeatable)")
+    parser.add_argument("--name", help="Only companies whose name matches this SQL LIKE pattern")
+    parser.add_argument("--stale-days", type=int, help="Only companies not verified in this many days")
+    parser.add_argument("--failed", action="store_true", help="Only companies without a website or with an unreachable one")
+    parser.add_argument("--all", action="store_true", help="Every company (required when no other scope is given)")
+    parser.add_argument("--job", default=DEFAULT_JOB_NAME, help="Checkpoint name; re-run with the same name to resume")
+    parser.add_argument("--restart", action="store_true", help="Discard an unfinished checkpoint and start over")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent companies")
+    parser.add_argument("--batch-size", type=int, default=100, help="Companies per bulk UPDATE and checkpoint")
+    parser.add_argument("--max-companies", type=int, help="Stop after this many companies (resume later)")
+    parser.add_argument("--clear-missing", action="store_true", help="Clear stored websites the search no longer finds")
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing them")
+    args = parser.parse_args()
+
+    if not (args.id or args.name or args.stale_days is not None or args.failed or args.all):
+        parser.error("choose a scope: --id, --name, --stale-days, --failed or --all")
+
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    stats = reverify_websites(
+        build_scope(args.id, args.name, args.stale_days, args.failed),
+        job=args.job,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        max_companies=args.max_companies,
+        clear_missing=args.clear_missing,
+        restart=args.restart,
+        dry_run=args.dry_run,
+    )
+    verb = "would update" if args.dry_run else "updated"
+    print(
+        f"Checked {stats['processed']} companies, {verb} {stats['updated']}, "
+        f"{stats['failed']} failures in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
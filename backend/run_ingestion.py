@@ -0,0 +1,63 @@
+"""
+Runs one ingestion pass from the command line and prints the slowest filings
+with their per-stage timings. With --profile the run is profiled with cProfile;
+the merged profile is written to PROFILE_DIR/ingest-<run_id>.prof (open it with
+`python -m pstats` or snakeviz) and each filing's hottest functions are stored
+on its trace (GET /ingestion/slow-companies?include_profile=true).
+
+Usage:
+    python -m backend.run_ingestion --limit 20
+    python -m backend.run_ingestion --limit 20 --profile --top 5
+"""
+import argparse
+import json
+import time
+
+from sqlalchemy import select
+
+from .ingestion import ingest_filings
+from .models import Base, engine, SessionLocal, IngestionTrace
+from .profiling import new_run_id
+
+
+def print_slowest(run_id: str, top: int, show_profile: bool):
+    db = SessionLocal()
+    try:
+        traces = db.scalars(
+            select(IngestionTrace)
+            .filter(IngestionTrace.run_id == run_id)
+            .order_by(IngestionTrace.total_seconds.desc())
+            .limit(top)
+        ).all()
+    finally:
+        db.close()
+
+    for trace in traces:
+        stages = json.loads(trace.stage_seconds or "{}")
+        breakdown = ", ".join(
+            f"{name} {seconds:.2f}s"
+            for name, seconds in sorted(stages.items(), key=lambda item: -item[1])
+        )
+        print(f"{trace.total_seconds:7.2f}s  {trace.outcome:<8} {trace.company_name or trace.link}")
+        print(f"          {breakdown}")
+        if show_profile and trace.profile:
+            print(trace.profile)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=10, help="Feed entries to ingest")
+    parser.add_argument("--profile", action="store_true", help="Profile the run with cProfile")
+    parser.add_argument("--top", type=int, default=10, help="Slowest filings to print")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    run_id = new_run_id()
+    start = time.perf_counter()
+    count = ingest_filings(args.limit, profile=args.profile, run_id=run_id)
+    print(f"Run {run_id}: ingested {count} filings in {time.perf_counter() - start:.1f}s\n")
+    print_slowest(run_id, args.top, args.profile)
+
+
+if __name__ == "__main__":
+    main()
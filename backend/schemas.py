@@ -0,0 +1,157 @@
+"""
+Response schemas for the API.
+Intelligence signals are stored as JSON text; the schemas decode them once into
+nested objects so clients receive real JSON instead of double-encoded strings.
+"""
+from datetime import date, datetime
+from typing import Any, List, Optional, Union
+
+import orjson
+from pydantic import BaseModel, ConfigDict, field_validator
+
+
+class Signal(BaseModel):
+    # Signals gain keys over time (e.g. AI enrichment); keep unknown ones
+    model_config = ConfigDict(extra="allow")
+
+
+class MaturityInfo(Signal):
+    age: Union[int, str] = "Unknown"
+    stage: str = "Unknown"
+    is_early_stage: bool = False
+
+
+class FundingDetails(Signal):
+    grant_size: str = "Unknown"
+    bottlenecks: List[str] = []
+    milestones: List[str] = []
+
+
+class FounderAnalysis(Signal):
+    technical_score: int = 0
+    design_score: int = 0
+    likely_gaps: List[str] = []
+
+
+class PublicPresence(Signal):
+    website_status: str = "Missing"
+    has_ui_artifacts: bool = False
+    quality_score: str = "Low"
+
+
+class HiringSignal(Signal):
+    is_hiring: bool = False
+    hiring_velocity: str = "Unknown"
+
+
+class DesignOpportunity(Signal):
+    phase: str = "Unknown"
+    needs: List[str] = []
+    priority: str = "Medium"
+
+
+SIGNAL_FIELDS = (
+    "maturity_info",
+    "funding_details",
+    "founder_analysis",
+    "public_presence_quality",
+    "hiring_signal",
+    "design_opportunity",
+)
+
+
+def decode_signal(value: Any) -> Optional[dict]:
+    if value is None or isinstance(value, dict):
+        return value
+    if not value:
+        return None
+    try:
+        decoded = orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return None
+    return decoded if isinstance(decoded, dict) else None
+
+
+class CompanyOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    cik: Optional[str] = None
+    name: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    industry: Optional[str] = None
+    founded_year: Optional[str] = None
+    latest_filing_date: Optional[date] = None
+    revenue_range: Optional[str] = None
+    amount_sold: Optional[str] = None
+    jurisdiction: Optional[str] = None
+    executive_name: Optional[str] = None
+    executive_title: Optional[str] = None
+    website_url: Optional[str] = None
+    careers_url: Optional[str] = None
+
+    # Intelligence Signals
+    maturity_info: Optional[MaturityInfo] = None
+    funding_details: Optional[FundingDetails] = None
+    founder_analysis: Optional[FounderAnalysis] = None
+    public_presence_quality: Optional[PublicPresence] = None
+    hiring_signal: Optional[HiringSignal] = None
+    design_opportunity: Optional[DesignOpportunity] = None
+    engagement_recommendation: Optional[str] = None
+
+    # AI Enrichment Status
+    enrichment_status: Optional[str] = None
+
+    @field_validator(*SIGNAL_FIELDS, mode="before")
+    @classmethod
+    def decode_signals(cls, value: Any):
+        return decode_signal(value)
+
+
+COMPANY_FIELDS = tuple(CompanyOut.model_fields)
+
+
+def company_to_dict(company) -> dict:
+    """
+    Plain-dict view of a Company shaped like CompanyOut.
+    Skips per-row model validation, which dominates serialization cost for large lists.
+    """
+    # Loaded column values live in __dict__; fall back to getattr for expired/deferred ones
+    loaded = company.__dict__
+    row = {name: loaded[name] if name in loaded else getattr(company, name) for name in COMPANY_FIELDS}
+    for name in SIGNAL_FIELDS:
+        row[name] = decode_signal(row[name])
+    return row
+
+
+def serialize_companies(companies) -> bytes:
+    return orjson.dumps([company_to_dict(c) for c in companies])
+
+
+def serialize_company_clusters(rows) -> bytes:
+    """(company, cluster_id, cluster_size) rows: CompanyOut dicts plus the two cluster fields."""
+    return orjson.dumps([
+        {**company_to_dict(company), "cluster_id": cluster_id, "cluster_size": cluster_size}
+        for company, cluster_id, cluster_size in rows
+    ])
+
+
+class IngestionTraceOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    run_id: str
+    link: Optional[str] = None
+    cik: Optional[str] = None
+    accession_number: Optional[str] = None
+    company_name: Optional[str] = None
+    outcome: Optional[str] = None
+    total_seconds: float
+    stage_seconds: Optional[dict] = None
+    profile: Optional[str] = None
+    created_at: datetime
+
+    @field_validator("stage_seconds", mode="before")
+    @classmethod
+    def decode_stages(cls, value: Any):
+        return decode_signal(value)
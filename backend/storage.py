@@ -0,0 +1,135 @@
+"""
+Storage configuration layer.
+Builds the SQLAlchemy engines for the configured DATABASE_URL, tuning SQLite
+for concurrent readers/writers (WAL) and sizing the pool for PostgreSQL.
+The sync engine serves scripts and background jobs; the async engine serves the API.
+"""
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from .config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_MMAP_SIZE,
+)
+
+
+# Async driver used for each backend when DATABASE_URL names a sync one
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def async_url(url: str) -> str:
+    """Maps e.g. sqlite:/// to sqlite+aiosqlite:/// and postgresql+psycopg2:// to postgresql+asyncpg://."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None or parsed.get_driver_name() == driver:
+        return url
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(hide_password=False)
+
+
+def sqlite_pragmas(journal_mode: str = SQLITE_JOURNAL_MODE) -> dict:
+    """
+    PRAGMAs applied to every new SQLite connection.
+    WAL lets readers proceed while a writer holds the lock, and the busy
+    timeout makes writers wait for each other instead of raising "database is locked".
+    """
+    return {
+        "journal_mode": journal_mode,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "cache_size": -SQLITE_CACHE_SIZE_KB,  # negative value = size in KiB
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
+
+
+def _install_sqlite_pragmas(engine, pragmas: dict):
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def _install_sqlite_transactions(engine):
+    """
+    pysqlite only issues BEGIN before DML, so a SAVEPOINT opening a transaction
+    runs outside one and its RELEASE commits. Disabling the driver's own
+    transaction handling and emitting BEGIN on every SQLAlchemy begin makes
+    begin_nested() nest inside the session's transaction.
+    """
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def begin_sqlite_transaction(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def engine_options(url: str, *, is_async: bool = False) -> dict:
+    """Keyword arguments for create_engine() appropriate to the backend."""
+    if is_sqlite(url):
+        # SQLite connections are cheap; the default QueuePool keeps a few
+        # per-thread connections open so PRAGMAs are not re-applied per request.
+        connect_args = {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+        if not is_async:
+            connect_args["check_same_thread"] = False
+        return {"connect_args": connect_args}
+
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def create_storage_engine(url: str = DATABASE_URL, *, journal_mode: str = SQLITE_JOURNAL_MODE, **kwargs) -> Engine:
+    """
+    Creates the engine for `url`.
+    Extra keyword arguments are passed through to create_engine().
+    """
+    options = {**engine_options(url), **kwargs}
+    engine = create_engine(url, **options)
+
+    if is_sqlite(url):
+        _install_sqlite_pragmas(engine, sqlite_pragmas(journal_mode))
+        _install_sqlite_transactions(engine)
+
+    return engine
+
+
+def create_async_storage_engine(url: str = DATABASE_URL, *, journal_mode: str = SQLITE_JOURNAL_MODE, **kwargs) -> AsyncEngine:
+    """
+    Async counterpart of create_storage_engine() with the same pool and PRAGMA settings.
+    """
+    url = async_url(url)
+    options = {**engine_options(url, is_async=True), **kwargs}
+    engine = create_async_engine(url, **options)
+
+    if is_sqlite(url):
+        # Connection events are only available on the underlying sync engine
+        _install_sqlite_pragmas(engine.sync_engine, sqlite_pragmas(journal_mode))
+
+    return engine
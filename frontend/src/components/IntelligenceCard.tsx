@@ -1,5 +1,5 @@
 import React from 'react';
-import type { Company } from '../types';
+import type { Company, Signal } from '../types';
 import { Lightbulb, Wrench, Globe, Flame } from 'lucide-react';
 import './IntelligenceCard.css';
 
@@ -7,10 +7,12 @@ interface IntelligenceCardProps {
     company: Company;
 }
 
-const parseJSON = (jsonString?: string) => {
-    if (!jsonString) return null;
+// Signals arrive as objects; older cached payloads may still carry JSON strings
+const parseJSON = <T extends Signal>(value?: T | string | null): T | null => {
+    if (!value) return null;
+    if (typeof value !== 'string') return value;
     try {
-        return JSON.parse(jsonString);
+        return JSON.parse(value) as T;
     } catch {
         return null;
     }
@@ -47,7 +49,7 @@ export const IntelligenceCard: React.FC<IntelligenceCardProps> = ({ company }) =
                 <div className="bottlenecks-section">
                     <strong>Bottlenecks</strong>
                     <ul className="bottlenecks-list">
-                        {funding?.bottlenecks?.map((b: string, i: number) => (
+                        {funding?.bottlenecks?.map((b, i) => (
                             <li key={i}>{b}</li>
                         )) || <li>None detected</li>}
                     </ul>
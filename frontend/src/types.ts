@@ -1,3 +1,41 @@
+// Intelligence signals are decoded server-side (backend/schemas.py); extra keys (e.g. AI enrichment) pass through
+export type Signal = Record<string, unknown>;
+
+export interface MaturityInfo extends Signal {
+    age: number | string;
+    stage: string;
+    is_early_stage: boolean;
+}
+
+export interface FundingDetails extends Signal {
+    grant_size: string;
+    bottlenecks: string[];
+    milestones: string[];
+}
+
+export interface FounderAnalysis extends Signal {
+    technical_score: number;
+    design_score: number;
+    likely_gaps: string[];
+}
+
+export interface PublicPresence extends Signal {
+    website_status: string;
+    has_ui_artifacts: boolean;
+    quality_score: string;
+}
+
+export interface HiringSignal extends Signal {
+    is_hiring: boolean;
+    hiring_velocity: string;
+}
+
+export interface DesignOpportunity extends Signal {
+    phase: string;
+    needs: string[];
+    priority: string;
+}
+
 export interface Company {
     id: number;
     cik: string;
@@ -15,13 +53,13 @@ export interface Company {
     website_url?: string;
     careers_url?: string;
 
-    // Intelligence Signals (stored as JSON strings)
-    maturity_info?: string;
-    funding_details?: string;
-    founder_analysis?: string;
-    public_presence_quality?: string;
-    hiring_signal?: string;
-    design_opportunity?: string;
+    // Intelligence Signals
+    maturity_info?: MaturityInfo | null;
+    funding_details?: FundingDetails | null;
+    founder_analysis?: FounderAnalysis | null;
+    public_presence_quality?: PublicPresence | null;
+    hiring_signal?: HiringSignal | null;
+    design_opportunity?: DesignOpportunity | null;
     engagement_recommendation?: string;
 
     // AI Enrichment Status
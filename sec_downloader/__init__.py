@@ -1,5 +1,22 @@
 __version__ = "0.12.2"
 from sec_downloader.core import Downloader
-from sec_downloader.download_storage import DownloadStorage, FileContent
+from sec_downloader.download_storage import (
+    DownloadStorage,
+    FileContent,
+    LazyFileContent,
+)
+from sec_downloader.feed import FeedEntry
+from sec_downloader.hooks import RequestEvent, RequestHooks, RequestStats
+from sec_downloader.metadata_table import FilingMetadataTable
 
-__all__ = ["Downloader", "DownloadStorage", "FileContent"]
+__all__ = [
+    "Downloader",
+    "DownloadStorage",
+    "FeedEntry",
+    "FileContent",
+    "FilingMetadataTable",
+    "LazyFileContent",
+    "RequestEvent",
+    "RequestHooks",
+    "RequestStats",
+]
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+from sec_edgar_downloader._constants import HOST_WWW_SEC, URL_FILING
+
+from sec_downloader.streaming import download_filing_to_file
+from sec_downloader.throttle import sec_get
+from sec_downloader.types import FilingMetadata
+
+INDEX_DOCUMENT = "index.json"
+# Requests are paced by the shared rate controller either way; this only
+# bounds how many responses are streamed at the same time.
+DEFAULT_MAX_WORKERS = 8
+
+
+class FilingDocument(NamedTuple):
+    name: str
+    url: str
+    size: Optional[int]
+
+
+def _filing_url(metadata: FilingMetadata, document: str) -> str:
+    return URL_FILING.format(
+        cik=metadata.cik.lstrip("0"),
+        acc_num_no_dash=metadata.accession_number.replace("-", ""),
+        document=document,
+    )
+
+
+def list_filing_documents(
+    metadata: FilingMetadata, user_agent: str
+) -> list[FilingDocument]:
+    """Documents of a filing (primary document, exhibits, XBRL, ...) from its `index.json`."""
+    index = sec_get(
+        _filing_url(metadata, INDEX_DOCUMENT), user_agent, HOST_WWW_SEC
+    ).json()
+    documents = []
+    for item in index["directory"]["item"]:
+        if item.get("type") == "dir":
+            continue
+        size = item.get("size")
+        documents.append(
+            FilingDocument(
+                name=item["name"],
+                url=_filing_url(metadata, item["name"]),
+                size=int(size) if str(size).isdigit() else None,
+            )
+        )
+    return documents
+
+
+def _is_present(path: Path, size: Optional[int]) -> bool:
+    if not path.is_file():
+        return False
+    return size is None or path.stat().st_size == size
+
+
+def download_filing_bundle(
+    metadata: FilingMetadata,
+    user_agent: str,
+    directory: Union[str, os.PathLike],
+    *,
+    pattern: str = "*",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> list[Path]:
+    """
+    Downloads the documents of a filing whose names match `pattern` into
+    `directory/<accession number>/`, several at a time. Files already present
+    with the size listed in the index are not downloaded again.
+    Returns the paths of all matching documents.
+    """
+    target_dir = Path(directory) / metadata.accession_number
+    documents = [
+        document
+        for document in list_filing_documents(metadata, user_agent)
+        if fnmatch(document.name, pattern)
+    ]
+    paths = [target_dir / document.name for document in documents]
+    missing = [
+        (document, path)
+        for document, path in zip(documents, paths)
+        if not _is_present(path, document.size)
+    ]
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            # Each worker runs in a copy of the caller's context, so request
+            # hooks active for the caller also see the document downloads
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    download_filing_to_file,
+                    document.url,
+                    user_agent,
+                    path,
+                )
+                for document, path in missing
+            ]
+            # Surface the first failure; completed files stay on disk for a retry
+            for future in futures:
+                future.result()
+
+    return paths
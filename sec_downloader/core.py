@@ -1,14 +1,35 @@
+import os
+import xml.etree.ElementTree as ET
 from collections import namedtuple
-from typing import Optional, Union
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
+from urllib.parse import urlparse
 
+from sec_edgar_downloader._constants import HOST_WWW_SEC
 from sec_edgar_downloader._Downloader import Downloader as SecEdgarDownloader
-from sec_edgar_downloader._orchestrator import get_ticker_to_cik_mapping
-from sec_edgar_downloader._sec_gateway import download_filing
 
+from sec_downloader.bundle import DEFAULT_MAX_WORKERS, download_filing_bundle
+from sec_downloader.feed import FeedEntry, filing_metadata_from_feed_entry
+from sec_downloader.hooks import RequestHooks, RequestStats, bind_hooks, observe
+from sec_downloader.http_cache import ConditionalResponse, conditional_get
+from sec_downloader.metadata_table import FilingMetadataTable
 from sec_downloader.sec_edgar_downloader_fork import (
     FilingMetadata,
     get_filing_metadata,
+    get_filings_table,
     get_latest_filings_metadata,
+    get_ticker_to_cik_mapping,
+)
+from sec_downloader.streaming import (
+    DEFAULT_CHUNK_SIZE,
+    download_filing_to_file,
+    iter_filing,
+)
+from sec_downloader.throttle import (
+    AdaptiveRateController,
+    sec_get,
+    sec_rate_controller,
 )
 from sec_downloader.types import CompanyAndAccessionNumber, RequestedFilings
 
@@ -21,15 +42,48 @@ class Downloader:
         self,
         company_name: str,
         email_address: str,
+        *,
+        hooks: Iterable[RequestHooks] = (),
     ):
         self.company_name = company_name
         self.email_address = email_address
-        self._ticker_to_cik_mapping = get_ticker_to_cik_mapping(self.user_agent)
+        self.request_stats = RequestStats()
+        self._hooks = (self.request_stats, *hooks)
+        with self._observed():
+            self._ticker_to_cik_mapping, _ = get_ticker_to_cik_mapping(self.user_agent)
 
     @property
     def user_agent(self):
         return f"{self.company_name} {self.email_address}"
 
+    def add_hook(self, hook: RequestHooks):
+        """
+        Registers an observer whose `on_request_start(url)` and
+        `on_request_end(event)` are called for every SEC request this
+        downloader sends. `request_stats` is always registered.
+        """
+        self._hooks = (*self._hooks, hook)
+
+    def _observed(self):
+        return observe(self._hooks)
+
+    def refresh_ticker_to_cik_mapping(self) -> bool:
+        """Re-checks the SEC ticker file; returns False when it was not modified."""
+        with self._observed():
+            self._ticker_to_cik_mapping, not_modified = get_ticker_to_cik_mapping(
+                self.user_agent
+            )
+        return not not_modified
+
+    def fetch(self, *, url: str) -> ConditionalResponse:
+        """
+        Conditional, gzip-compressed GET of an SEC resource such as the EDGAR
+        Atom feed. `not_modified` is True when the resource is unchanged since
+        the previous fetch of the same URL in this process.
+        """
+        with self._observed():
+            return conditional_get(url, self.user_agent, urlparse(url).netloc)
+
     def get_filing_metadatas(
         self,
         query: Union[str, RequestedFilings, CompanyAndAccessionNumber],
@@ -44,32 +98,128 @@ class Downloader:
                 if new_query is not None:
                     query = new_query
             if isinstance(query, CompanyAndAccessionNumber):
-                return [
-                    get_filing_metadata(
-                        ticker_or_cik=query.ticker_or_cik,
-                        accession_number=query.accession_number,
-                        user_agent=self.user_agent,
-                        ticker_to_cik_mapping=self._ticker_to_cik_mapping,
-                        include_amends=include_amends,
-                    )
-                ]
+                with self._observed():
+                    return [
+                        get_filing_metadata(
+                            ticker_or_cik=query.ticker_or_cik,
+                            accession_number=query.accession_number,
+                            user_agent=self.user_agent,
+                            ticker_to_cik_mapping=self._ticker_to_cik_mapping,
+                            include_amends=include_amends,
+                        )
+                    ]
 
         if isinstance(query, (RequestedFilings, str)):
             if isinstance(query, str):
                 query = RequestedFilings.from_string(query)
 
-            new_metadatas = get_latest_filings_metadata(
-                requested=query,
+            with self._observed():
+                new_metadatas = get_latest_filings_metadata(
+                    requested=query,
+                    user_agent=self.user_agent,
+                    ticker_to_cik_mapping=self._ticker_to_cik_mapping,
+                    include_amends=include_amends,
+                )
+            return new_metadatas
+
+        raise ValueError(f"Invalid input: {query}")
+
+    def get_filing_metadata_from_feed_entry(
+        self,
+        entry: Union[FeedEntry, ET.Element],
+        *,
+        include_amends: bool = False,
+    ) -> FilingMetadata:
+        """
+        Metadata for an EDGAR Atom feed entry.
+        Built from the entry itself when possible; the submissions JSON is
+        only downloaded when the entry lacks a required field.
+        """
+        if isinstance(entry, ET.Element):
+            entry = FeedEntry.from_element(entry)
+        metadata = filing_metadata_from_feed_entry(entry, include_amends=include_amends)
+        if metadata is not None:
+            return metadata
+        metadatas = self.get_filing_metadatas(entry.link, include_amends=include_amends)
+        return metadatas[0]
+
+    def get_filing_metadata_table(
+        self,
+        ticker_or_cik: str,
+        *,
+        after: Optional[Union[str, date]] = None,
+        before: Optional[Union[str, date]] = None,
+    ) -> FilingMetadataTable:
+        """
+        Every filing of a company as a compact columnar table, for filers with
+        many thousands of filings. Filter with `table.filter(form_type=..., after=...)`;
+        rows become `FilingMetadata` only when accessed.
+        """
+        with self._observed():
+            return get_filings_table(
+                ticker_or_cik=ticker_or_cik,
                 user_agent=self.user_agent,
                 ticker_to_cik_mapping=self._ticker_to_cik_mapping,
-                include_amends=include_amends,
+                after=after,
+                before=before,
             )
-            return new_metadatas
 
-        raise ValueError(f"Invalid input: {query}")
+    @property
+    def rate_controller(self) -> AdaptiveRateController:
+        """
+        Adaptive throttle shared by all SEC requests of this process;
+        `rate_controller.current_rate` is the rate currently allowed.
+        """
+        return sec_rate_controller
 
     def download_filing(self, *, url: str) -> bytes:
-        return download_filing(url, self.user_agent)
+        with self._observed():
+            return sec_get(url, self.user_agent, HOST_WWW_SEC).content
+
+    def iter_filing(
+        self, *, url: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Streaming variant of `download_filing()`: yields decoded chunks."""
+        return bind_hooks(
+            iter_filing(url, self.user_agent, chunk_size=chunk_size), self._hooks
+        )
+
+    def download_filing_to_file(
+        self,
+        *,
+        url: str,
+        path: Union[str, os.PathLike],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Path:
+        """
+        Streams the filing to `path` with bounded memory and returns the path.
+        Use `sec_downloader.streaming.mapped_file(path)` for a zero-copy view.
+        """
+        with self._observed():
+            return download_filing_to_file(
+                url, self.user_agent, path, chunk_size=chunk_size
+            )
+
+    def download_filing_bundle(
+        self,
+        metadata: FilingMetadata,
+        *,
+        directory: Union[str, os.PathLike],
+        pattern: str = "*",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> list[Path]:
+        """
+        Downloads all documents of a filing matching `pattern` (e.g. "*.htm",
+        "*.xml") concurrently into `directory`, e.g. a `DownloadStorage` dir.
+        """
+        with self._observed():
+            return download_filing_bundle(
+                metadata,
+                self.user_agent,
+                directory,
+                pattern=pattern,
+                max_workers=max_workers,
+            )
 
     def get_filing_html(
         self,
@@ -2,14 +2,69 @@ import shutil
 import tempfile
 from glob import glob
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 
 from sec_downloader.core import DEFAULT_FILTER_PATTERN, FileContent
+from sec_downloader.streaming import mapped_file
+
+
+class LazyFileContent:
+    """
+    Handle to a downloaded file that is only read when asked.
+    Unpacks like `FileContent` (`path, content = handle`), but `content`
+    is decoded on every access instead of being kept in memory.
+    """
+
+    __slots__ = ("path", "absolute_path")
+
+    def __init__(self, path: Path, absolute_path: Path):
+        self.path = path
+        self.absolute_path = absolute_path
+
+    @property
+    def content(self) -> str:
+        return self.read_text()
+
+    def read_text(self, encoding: str = "utf-8", errors: str = "ignore") -> str:
+        with open(self.absolute_path, "r", encoding=encoding, errors=errors) as f:
+            return f.read()
+
+    def read_bytes(self) -> bytes:
+        return self.absolute_path.read_bytes()
+
+    def mmap(self):
+        """Context manager with a read-only memory map of the file."""
+        return mapped_file(self.absolute_path)
+
+    def __iter__(self):
+        yield self.path
+        yield self.content
+
+    def __repr__(self) -> str:
+        return f"LazyFileContent(path={self.path!r})"
 
 
 class DownloadStorage:
-    def __init__(self, *, filter_pattern: Optional[str] = None):
+    """
+    Temporary directory for downloads, read back when the context exits.
+
+    By default every matched file is read into memory and the directory is
+    deleted. With `lazy=True` the files are kept, and `get_file_contents()`
+    returns `LazyFileContent` handles that read on demand. Pass `cache_dir`
+    to move the downloads into a directory you manage. Otherwise call
+    `cleanup()` when you are done with the files.
+    """
+
+    def __init__(
+        self,
+        *,
+        filter_pattern: Optional[str] = None,
+        lazy: bool = False,
+        cache_dir: Optional[Union[str, Path]] = None,
+    ):
         self.glob_pattern = filter_pattern or DEFAULT_FILTER_PATTERN
+        self.lazy = lazy or cache_dir is not None
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
         self.temp_dir = None
         self.file_contents = None
 
@@ -18,24 +73,53 @@ class DownloadStorage:
         return self.temp_dir
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.lazy:
+            self._keep_files()
+            return
         self._read_files()
         if self.temp_dir:
             shutil.rmtree(self.temp_dir)
 
-    def _read_files(self):
-        self.file_contents = []
+    def _matched_paths(self) -> list[Path]:
         assert self.temp_dir is not None, "Temp dir should be set"
         glob_path = Path(self.temp_dir) / self.glob_pattern
-        for filepath in glob(str(glob_path), recursive=True):
-            path = Path(filepath)
+        return [Path(filepath) for filepath in glob(str(glob_path), recursive=True)]
+
+    def _read_files(self):
+        self.file_contents = []
+        for path in self._matched_paths():
             relative_path = path.relative_to(self.temp_dir)
-            with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
                 content = f.read()
             self.file_contents.append(FileContent(relative_path, content))
 
+    def _keep_files(self):
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Each download gets its own subdirectory, so runs never collide
+            target = self.cache_dir / Path(self.temp_dir).name
+            shutil.move(self.temp_dir, target)
+            self.temp_dir = str(target)
+        self.file_contents = [
+            LazyFileContent(path.relative_to(self.temp_dir), path)
+            for path in self._matched_paths()
+        ]
+
     def get_file_contents(self):
         if self.file_contents is None:
             raise RuntimeError(
                 "File contents are not available until the context is exited."
             )
         return self.file_contents
+
+    def iter_file_contents(self) -> Iterator[FileContent]:
+        """Yields `FileContent` one file at a time; in lazy mode only one is in memory."""
+        for file_content in self.get_file_contents():
+            yield FileContent(*file_content)
+
+    def cleanup(self):
+        """Deletes the kept files of a lazy storage."""
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+        self.file_contents = None
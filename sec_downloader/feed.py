@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Optional
+
+from sec_edgar_downloader._constants import AMENDS_SUFFIX, CIK_LENGTH, URL_FILING
+
+from sec_downloader.types import FilingMetadata
+
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+
+# Forms whose primary document name is fixed, so its URL can be built from
+# the CIK and accession number alone.
+FIXED_PRIMARY_DOCUMENTS = {
+    "D": "primary_doc.xml",
+}
+
+# e.g. "D - Acme Robotics, Inc. (0001234567) (Filer)"
+_TITLE_RE = re.compile(
+    r"^(?P<form>.+?) - (?P<name>.+) \((?P<cik>\d{1,10})\)(?: \((?P<role>[^)]+)\))?$"
+)
+# e.g. "<b>Filed:</b> 2024-01-05 <b>AccNo:</b> 0001234567-24-000001 <b>Size:</b> 5 KB"
+_FILED_RE = re.compile(r"Filed:(?:\s*</b>)?\s*(\d{4}-\d{2}-\d{2})")
+_ACCNO_RE = re.compile(r"(\d{10}-\d{2}-\d{6})")
+# e.g. https://www.sec.gov/Archives/edgar/data/1234567/000123456724000001/...-index.htm
+_LINK_RE = re.compile(r"/Archives/edgar/data/(\d+)/(\d{18})/")
+
+
+@dataclass
+class FeedEntry:
+    title: str
+    link: str
+    updated: str = ""
+    form_type: str = ""
+    summary: str = ""
+    id: str = ""
+
+    @classmethod
+    def from_element(cls, entry: ET.Element) -> "FeedEntry":
+        """Reads an <entry> of an EDGAR Atom feed (e.g. the `getcurrent` feed)."""
+
+        def text(tag: str) -> str:
+            found = entry.find(f"atom:{tag}", ATOM_NS)
+            return (found.text or "").strip() if found is not None else ""
+
+        link = entry.find("atom:link", ATOM_NS)
+        category = entry.find("atom:category", ATOM_NS)
+        return cls(
+            title=text("title"),
+            link=link.attrib.get("href", "") if link is not None else "",
+            updated=text("updated"),
+            form_type=category.attrib.get("term", "") if category is not None else "",
+            summary=text("summary"),
+            id=text("id"),
+        )
+
+
+def filing_metadata_from_feed_entry(
+    entry: FeedEntry,
+    *,
+    include_amends: bool = False,
+) -> Optional[FilingMetadata]:
+    """
+    Builds FilingMetadata from the feed entry alone, without any request.
+    Returns None when a required field cannot be derived from the entry,
+    in which case the caller should fall back to the submissions JSON.
+    Fields the feed does not carry (tickers, items, report date, primary
+    document description) are left empty.
+    """
+    title_match = _TITLE_RE.match(entry.title)
+    link_match = _LINK_RE.search(entry.link)
+
+    form_type = entry.form_type or (title_match.group("form") if title_match else "")
+    company_name = title_match.group("name") if title_match else None
+
+    cik = None
+    if title_match:
+        cik = title_match.group("cik")
+    elif link_match:
+        cik = link_match.group(1)
+
+    accession_number = None
+    for source in (entry.summary, entry.id):
+        accno_match = _ACCNO_RE.search(source)
+        if accno_match:
+            accession_number = accno_match.group(1)
+            break
+    if accession_number is None and link_match:
+        raw = link_match.group(2)
+        accession_number = f"{raw[:10]}-{raw[10:12]}-{raw[12:]}"
+
+    # The Atom <updated> timestamp is the acceptance time, which can fall on
+    # the day before the official filing date; only the summary is authoritative.
+    filed_match = _FILED_RE.search(entry.summary)
+    filing_date = filed_match.group(1) if filed_match else None
+
+    is_amend = form_type.endswith(AMENDS_SUFFIX)
+    if is_amend:
+        if not include_amends:
+            raise ValueError(f"Could not find filing for {accession_number}")
+        form_type = form_type[: -len(AMENDS_SUFFIX)]
+
+    primary_doc = FIXED_PRIMARY_DOCUMENTS.get(form_type)
+    if not (cik and accession_number and filing_date and company_name and primary_doc):
+        return None
+
+    primary_doc_url = URL_FILING.format(
+        cik=cik.lstrip("0"),
+        acc_num_no_dash=accession_number.replace("-", ""),
+        document=primary_doc,
+    )
+    return FilingMetadata(
+        accession_number=accession_number,
+        form_type=form_type,
+        primary_doc_url=primary_doc_url,
+        items="",
+        primary_doc_description="",
+        filing_date=filing_date,
+        report_date="",
+        cik=cik.zfill(CIK_LENGTH),
+        company_name=company_name,
+        tickers=[],
+    )
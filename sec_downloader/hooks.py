@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, NamedTuple, Optional, TypeVar
+from urllib.parse import urlparse
+
+T = TypeVar("T")
+
+
+class RequestEvent(NamedTuple):
+    url: str
+    # HTTP status of the final attempt; None when no response was received
+    status: Optional[int] = None
+    # Body size on the wire (Content-Length), or the decoded size when the
+    # server did not send one; None for streamed bodies of unknown length
+    bytes: Optional[int] = None
+    # Seconds from the first attempt to the response, including throttling and retries
+    latency: float = 0.0
+    # True when the server answered 304 and a cached copy was used
+    cache_hit: bool = False
+    attempts: int = 1
+    error: Optional[BaseException] = None
+
+    @property
+    def endpoint(self) -> str:
+        return endpoint_name(self.url)
+
+
+class RequestHooks:
+    """
+    Base class for request observers. Override either method; both are called
+    from the thread that sends the request, so implementations must be quick
+    and thread-safe. Exceptions raised by a hook propagate to the caller.
+    """
+
+    def on_request_start(self, url: str):
+        pass
+
+    def on_request_end(self, event: RequestEvent):
+        pass
+
+
+def endpoint_name(url: str) -> str:
+    """Groups SEC URLs into endpoints, e.g. "submissions" or "filing-document"."""
+    parsed = urlparse(url)
+    path = parsed.path
+    if path.startswith("/submissions/"):
+        return "submissions"
+    # company_tickers.json, company_tickers_exchange.json (URL_CIK_MAPPING), ...
+    if path.startswith("/files/company_tickers"):
+        return "company-tickers"
+    if path.startswith("/cgi-bin/browse-edgar"):
+        return "browse-edgar"
+    if path.startswith("/Archives/edgar/data/"):
+        if path.endswith("/index.json"):
+            return "filing-index"
+        return "filing-document"
+    first_segment = path.strip("/").split("/", 1)[0]
+    return f"{parsed.netloc}/{first_segment}" if first_segment else parsed.netloc
+
+
+class _EndpointStats:
+    __slots__ = ("requests", "errors", "cache_hits", "bytes", "latency", "max_latency", "retries")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.bytes = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+        self.retries = 0
+
+    def add(self, event: RequestEvent):
+        self.requests += 1
+        self.errors += event.error is not None
+        self.cache_hits += event.cache_hit
+        self.bytes += event.bytes or 0
+        self.latency += event.latency
+        self.max_latency = max(self.max_latency, event.latency)
+        self.retries += event.attempts - 1
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "total_latency": self.latency,
+            "mean_latency": self.latency / self.requests if self.requests else 0.0,
+            "max_latency": self.max_latency,
+        }
+
+
+class RequestStats(RequestHooks):
+    """
+    Built-in collector: request count, errors, 304 cache hits, retries,
+    transferred bytes and latency, per endpoint and in total.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, _EndpointStats] = {}
+
+    def on_request_end(self, event: RequestEvent):
+        with self._lock:
+            stats = self._endpoints.get(event.endpoint)
+            if stats is None:
+                stats = self._endpoints[event.endpoint] = _EndpointStats()
+            stats.add(event)
+
+    def summary(self) -> dict[str, dict]:
+        """Statistics per endpoint, e.g. `summary()["submissions"]["bytes"]`."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._endpoints.items())}
+
+    def total(self) -> dict:
+        total = _EndpointStats()
+        with self._lock:
+            for stats in self._endpoints.values():
+                total.requests += stats.requests
+                total.errors += stats.errors
+                total.cache_hits += stats.cache_hits
+                total.retries += stats.retries
+                total.bytes += stats.bytes
+                total.latency += stats.latency
+                total.max_latency = max(total.max_latency, stats.max_latency)
+        return total.as_dict()
+
+    @property
+    def total_bytes(self) -> int:
+        return self.total()["bytes"]
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+# Hooks of the Downloader (or `observe()` block) that issued the current request.
+# A context variable keeps concurrent Downloaders and threads apart.
+_active_hooks: contextvars.ContextVar[tuple[RequestHooks, ...]] = contextvars.ContextVar(
+    "sec_downloader_request_hooks", default=()
+)
+
+
+def active_hooks() -> tuple[RequestHooks, ...]:
+    return _active_hooks.get()
+
+
+@contextmanager
+def observe(hooks: Iterable[RequestHooks]):
+    """Sends the events of every SEC request made inside the block to `hooks`."""
+    token = _active_hooks.set(tuple(hooks))
+    try:
+        yield
+    finally:
+        _active_hooks.reset(token)
+
+
+def bind_hooks(iterator: Iterator[T], hooks: Iterable[RequestHooks]) -> Iterator[T]:
+    """
+    Runs a lazy iterator (e.g. a streamed download) with `hooks` active,
+    however late it is consumed, without leaking them to the consumer.
+    """
+    context = contextvars.copy_context()
+    context.run(_active_hooks.set, tuple(hooks))
+    while True:
+        try:
+            yield context.run(next, iterator)
+        except StopIteration:
+            return
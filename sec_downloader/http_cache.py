@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+
+from sec_downloader.throttle import sec_get
+
+# Submissions JSON of large filers is a few MB; keep the cache bounded
+DEFAULT_MAX_ENTRIES = 64
+
+
+class ConditionalResponse(NamedTuple):
+    content: bytes
+    # True when the server answered 304 and `content` is the cached copy
+    not_modified: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class _Entry:
+    __slots__ = ("etag", "last_modified", "content", "parsed")
+
+    def __init__(self, etag, last_modified, content):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+        self.parsed = None
+
+
+class ValidatorCache:
+    """
+    In-process LRU of responses with their ETag / Last-Modified validators,
+    used to turn repeated fetches of unchanged resources into 304 round trips.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, uri: str) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(uri)
+            if entry is not None:
+                self._entries.move_to_end(uri)
+            return entry
+
+    def put(self, uri: str, entry: _Entry):
+        with self._lock:
+            self._entries[uri] = entry
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+default_cache = ValidatorCache()
+
+
+def _validator_headers(entry: Optional[_Entry]) -> dict:
+    if entry is None:
+        return {}
+    headers = {}
+    if entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+def _fetch(
+    uri: str, user_agent: str, host: str, cache: ValidatorCache
+) -> tuple[_Entry, bool]:
+    cached = cache.get(uri)
+    resp = sec_get(uri, user_agent, host, headers=_validator_headers(cached))
+    if resp.status_code == 304 and cached is not None:
+        return cached, True
+
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    entry = _Entry(etag, last_modified, resp.content)
+    if etag or last_modified:
+        cache.put(uri, entry)
+    return entry, False
+
+
+def conditional_get(
+    uri: str,
+    user_agent: str,
+    host: str,
+    *,
+    cache: ValidatorCache = default_cache,
+) -> ConditionalResponse:
+    """
+    GET with the validators from the previous response to `uri`, if any.
+    The body is transferred gzip-compressed. On 304 Not Modified the cached
+    body is returned with `not_modified=True`.
+    """
+    entry, not_modified = _fetch(uri, user_agent, host, cache)
+    return ConditionalResponse(
+        entry.content, not_modified, entry.etag, entry.last_modified
+    )
+
+
+def get_json(
+    uri: str,
+    user_agent: str,
+    host: str,
+    *,
+    cache: ValidatorCache = default_cache,
+) -> tuple[Any, bool]:
+    """
+    Parsed JSON of `uri` and whether it was not modified. The parsed value
+    is reused while the resource is unchanged, so treat it as read-only.
+    """
+    entry, not_modified = _fetch(uri, user_agent, host, cache)
+    if entry.parsed is None:
+        entry.parsed = json.loads(entry.content)
+    return entry.parsed, not_modified
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+from array import array
+from datetime import date
+from itertools import compress
+from typing import Iterable, Iterator, Optional, Union, overload
+
+from sec_edgar_downloader._constants import AMENDS_SUFFIX
+from sec_edgar_downloader._orchestrator import get_to_download
+
+from sec_downloader.types import FilingMetadata, Ticker
+
+# Report dates are often missing; 0 is never a valid proleptic ordinal
+NO_DATE = 0
+
+
+def _date_ordinal(value: Union[str, date, None]) -> int:
+    if not value:
+        return NO_DATE
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def _date_string(ordinal: int) -> str:
+    return date.fromordinal(ordinal).isoformat() if ordinal != NO_DATE else ""
+
+
+def _accession_int(accession_number: str) -> int:
+    # 18 digits always fit in a signed 64-bit integer
+    return int(accession_number.replace("-", ""))
+
+
+def _accession_string(value: int) -> str:
+    digits = f"{value:018d}"
+    return f"{digits[:10]}-{digits[10:12]}-{digits[12:]}"
+
+
+class StringTable:
+    """Interns repeated strings (form types, items, descriptions) as small integer codes."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def matching(self, predicate) -> set[int]:
+        """Codes of the distinct values satisfying `predicate`, evaluated once per value."""
+        return {code for code, value in enumerate(self.values) if predicate(value)}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class FilingMetadataTable:
+    """
+    Columnar view of one company's filings.
+
+    Every filing is a row across compact `array` columns: accession numbers as
+    64-bit integers, dates as ordinals, and form type, items and primary document
+    description as codes into shared string tables. Company fields (CIK, name,
+    tickers) are stored once. Filters evaluate their predicate once per distinct
+    string and then select rows by code, and return a new table over the selected
+    rows. `FilingMetadata` objects are only built when a row is accessed.
+    """
+
+    __slots__ = (
+        "cik",
+        "company_name",
+        "tickers",
+        "forms",
+        "items_table",
+        "descriptions",
+        "accession_numbers",
+        "form_codes",
+        "filing_dates",
+        "report_dates",
+        "items_codes",
+        "description_codes",
+        "primary_documents",
+    )
+
+    def __init__(self, *, cik: str, company_name: str, tickers: list[Ticker]):
+        self.cik = cik
+        self.company_name = company_name
+        self.tickers = tickers
+        self.forms = StringTable()
+        self.items_table = StringTable()
+        self.descriptions = StringTable()
+        self.accession_numbers = array("q")
+        self.form_codes = array("H")
+        self.filing_dates = array("l")
+        self.report_dates = array("l")
+        self.items_codes = array("I")
+        self.description_codes = array("I")
+        self.primary_documents: list[str] = []
+
+    def extend(self, filings_json: dict):
+        """Appends one page of the submissions JSON (the `filings.recent` columns or a later page)."""
+        self.accession_numbers.extend(
+            map(_accession_int, filings_json["accessionNumber"])
+        )
+        self.form_codes.extend(map(self.forms.code, filings_json["form"]))
+        self.filing_dates.extend(map(_date_ordinal, filings_json["filingDate"]))
+        self.report_dates.extend(map(_date_ordinal, filings_json["reportDate"]))
+        self.items_codes.extend(map(self.items_table.code, filings_json["items"]))
+        self.description_codes.extend(
+            map(self.descriptions.code, filings_json["primaryDocDescription"])
+        )
+        self.primary_documents.extend(filings_json["primaryDocument"])
+
+    def __len__(self) -> int:
+        return len(self.accession_numbers)
+
+    @overload
+    def __getitem__(self, index: int) -> FilingMetadata: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "FilingMetadataTable": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FilingMetadataTable index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[FilingMetadata]:
+        for index in range(len(self)):
+            yield self._materialize(index)
+
+    def __repr__(self) -> str:
+        return (
+            f"FilingMetadataTable(cik={self.cik!r}, company_name={self.company_name!r}, "
+            f"rows={len(self)}, form_types={len(self.forms)})"
+        )
+
+    def _materialize(self, index: int) -> FilingMetadata:
+        accession_number = _accession_string(self.accession_numbers[index])
+        form_type = self.forms.values[self.form_codes[index]]
+        if form_type.endswith(AMENDS_SUFFIX):
+            form_type = form_type[: -len(AMENDS_SUFFIX)]
+        td = get_to_download(self.cik, accession_number, self.primary_documents[index])
+        return FilingMetadata(
+            accession_number=accession_number,
+            form_type=form_type,
+            primary_doc_url=td.primary_doc_uri,
+            items=self.items_table.values[self.items_codes[index]],
+            primary_doc_description=self.descriptions.values[
+                self.description_codes[index]
+            ],
+            filing_date=_date_string(self.filing_dates[index]),
+            report_date=_date_string(self.report_dates[index]),
+            cik=self.cik,
+            company_name=self.company_name,
+            tickers=self.tickers,
+        )
+
+    def to_list(self) -> list[FilingMetadata]:
+        return list(self)
+
+    def take(self, indices: Iterable[int]) -> "FilingMetadataTable":
+        """New table with the given rows, in the given order. String tables are shared."""
+        indices = list(indices)
+        table = FilingMetadataTable(
+            cik=self.cik, company_name=self.company_name, tickers=self.tickers
+        )
+        table.forms = self.forms
+        table.items_table = self.items_table
+        table.descriptions = self.descriptions
+        for name in (
+            "accession_numbers",
+            "form_codes",
+            "filing_dates",
+            "report_dates",
+            "items_codes",
+            "description_codes",
+        ):
+            column = getattr(self, name)
+            getattr(table, name).extend(column[i] for i in indices)
+        table.primary_documents = [self.primary_documents[i] for i in indices]
+        return table
+
+    def _where(self, mask: Iterable[bool]) -> "FilingMetadataTable":
+        return self.take(compress(range(len(self)), mask))
+
+    def filter(
+        self,
+        *,
+        form_type: Union[str, Iterable[str], None] = None,
+        after: Union[str, date, None] = None,
+        before: Union[str, date, None] = None,
+        items: Union[str, Iterable[str], None] = None,
+        include_amends: bool = False,
+    ) -> "FilingMetadataTable":
+        """
+        Rows matching every given criterion. `form_type` matches the base form, so
+        amendments are included with `include_amends`; `after`/`before` bound the
+        filing date inclusively; `items` keeps filings reporting any of the items.
+        """
+        masks = []
+
+        if form_type is not None or not include_amends:
+            wanted = {form_type} if isinstance(form_type, str) else form_type
+            wanted = {f.upper() for f in wanted} if wanted is not None else None
+
+            def form_matches(value: str) -> bool:
+                is_amend = value.endswith(AMENDS_SUFFIX)
+                if is_amend and not include_amends:
+                    return False
+                base = value[: -len(AMENDS_SUFFIX)] if is_amend else value
+                return wanted is None or base in wanted
+
+            codes = self.forms.matching(form_matches)
+            masks.append(map(codes.__contains__, self.form_codes))
+
+        if after is not None:
+            lower = _date_ordinal(after)
+            masks.append(map(lower.__le__, self.filing_dates))
+        if before is not None:
+            upper = _date_ordinal(before)
+            masks.append(map(upper.__ge__, self.filing_dates))
+
+        if items is not None:
+            wanted_items = {items} if isinstance(items, str) else set(items)
+            codes = self.items_table.matching(
+                lambda value: not wanted_items.isdisjoint(
+                    item.strip() for item in value.split(",")
+                )
+            )
+            masks.append(map(codes.__contains__, self.items_codes))
+
+        if not masks:
+            return self[:]
+        return self._where(map(all, zip(*masks)))
+
+    def sort_by_date(self, *, descending: bool = True) -> "FilingMetadataTable":
+        order = sorted(
+            range(len(self)), key=self.filing_dates.__getitem__, reverse=descending
+        )
+        return self.take(order)
+
+    def head(self, n: int) -> "FilingMetadataTable":
+        return self[:n]
+
+    def form_counts(self) -> dict[str, int]:
+        """Number of rows per form type as filed (amendments keep their suffix)."""
+        counts = [0] * len(self.forms)
+        for code in self.form_codes:
+            counts[code] += 1
+        return {
+            form: count for form, count in zip(self.forms.values, counts) if count
+        }
@@ -2,25 +2,50 @@ from __future__ import annotations
 
 import re
 import sys
-from collections import deque
-from typing import Optional, Union
+from datetime import date
+from typing import Iterator, Optional, Union
 
+from sec_downloader.http_cache import get_json
+from sec_downloader.metadata_table import FilingMetadataTable
 from sec_downloader.types import FilingMetadata, RequestedFilings, Ticker
 from sec_edgar_downloader._Downloader import Downloader
 from sec_edgar_downloader._constants import (
     AMENDS_SUFFIX,
     CIK_LENGTH,
+    HOST_DATA_SEC,
+    HOST_WWW_SEC,
     SUBMISSION_FILE_FORMAT,
     SUPPORTED_FORMS,
+    URL_CIK_MAPPING,
     URL_SUBMISSIONS,
 )
 from sec_edgar_downloader._orchestrator import get_to_download
-from sec_edgar_downloader._sec_gateway import get_list_of_available_filings
-from sec_edgar_downloader._utils import validate_and_convert_ticker_or_cik
+from sec_edgar_downloader._utils import (
+    validate_and_convert_ticker_or_cik,
+    validate_and_parse_date,
+)
 
 accession_number_re = re.compile(r"^\d{10}-\d{2}-\d{6}$")
 
 
+def get_list_of_available_filings(uri: str, user_agent: str):
+    # Conditional request: an unchanged submissions page costs a 304 round trip
+    return get_json(uri, user_agent, HOST_DATA_SEC)[0]
+
+
+def get_ticker_to_cik_mapping(user_agent: str) -> tuple[dict[str, str], bool]:
+    """Ticker -> zero-padded CIK, and whether the SEC file was not modified since the last fetch."""
+    ticker_metadata, not_modified = get_json(URL_CIK_MAPPING, user_agent, HOST_WWW_SEC)
+    fields = ticker_metadata["fields"]
+    cik_idx = fields.index("cik")
+    ticker_idx = fields.index("ticker")
+    mapping = {
+        str(td[ticker_idx]).upper(): str(td[cik_idx]).zfill(CIK_LENGTH)
+        for td in ticker_metadata["data"]
+    }
+    return mapping, not_modified
+
+
 def get_filing_metadata(
     *,
     ticker_or_cik: str,
@@ -60,33 +85,133 @@ def get_latest_filings_metadata(
         requested.ticker_or_cik, ticker_to_cik_mapping
     )
 
-    if requested.limit is None:
-        # If amount is not specified, obtain all available filings.
-        # We simply need a large number to denote this and the loop
-        # responsible for fetching the URLs will break appropriately.
-        limit = sys.maxsize
-    else:
-        limit = int(requested.limit)
-        if limit < 1:
-            raise ValueError("Invalid amount. Please enter a number greater than 1.")
-
-    if requested.form_type not in SUPPORTED_FORMS:
-        form_options = ", ".join(Downloader.supported_forms)
-        raise ValueError(
-            f"{requested.form_type!r} forms are not supported. "
-            f"Please choose from the following: {form_options}."
-        )
+    form_limits = {}
+    for form_type, limit in requested.limits_by_form().items():
+        if form_type not in SUPPORTED_FORMS:
+            form_options = ", ".join(Downloader.supported_forms)
+            raise ValueError(
+                f"{form_type!r} forms are not supported. "
+                f"Please choose from the following: {form_options}."
+            )
+        if limit is None:
+            # If amount is not specified, obtain all available filings.
+            # We simply need a large number to denote this and the loop
+            # responsible for fetching the URLs will break appropriately.
+            form_limits[form_type] = sys.maxsize
+        else:
+            limit = int(limit)
+            if limit < 1:
+                raise ValueError(
+                    "Invalid amount. Please enter a number greater than 1."
+                )
+            form_limits[form_type] = limit
+
+    after, before = _validate_date_range(requested.after, requested.before)
 
     return _get_metadatas(
         cik=cik,
         user_agent=user_agent,
-        limit=limit,
+        limit=sum(form_limits.values()),
         ticker_or_cik=requested.ticker_or_cik,
-        form_type=requested.form_type,
+        form_limits=form_limits,
         include_amends=include_amends,
+        after=after,
+        before=before,
     )
 
 
+def get_filings_table(
+    *,
+    ticker_or_cik: str,
+    user_agent: str,
+    ticker_to_cik_mapping: dict[str, str],
+    after: Optional[Union[str, date]] = None,
+    before: Optional[Union[str, date]] = None,
+) -> FilingMetadataTable:
+    """All filings of a company (amendments included) as a columnar table."""
+    cik = validate_and_convert_ticker_or_cik(ticker_or_cik, ticker_to_cik_mapping)
+    after, before = _validate_date_range(after, before)
+
+    table = None
+    for company_json, filings_json in _iter_submission_pages(
+        cik, user_agent, after=after, before=before
+    ):
+        if table is None:
+            table = FilingMetadataTable(
+                cik=str(company_json["cik"]).zfill(CIK_LENGTH),
+                company_name=company_json["name"],
+                tickers=_company_tickers(company_json),
+            )
+        table.extend(filings_json)
+    assert table is not None
+
+    if after or before:
+        table = table.filter(after=after, before=before, include_amends=True)
+    return table
+
+
+def _validate_date(value) -> Optional[str]:
+    if value is None:
+        return None
+    return validate_and_parse_date(value).strftime("%Y-%m-%d")
+
+
+def _validate_date_range(after, before) -> tuple[Optional[str], Optional[str]]:
+    after = _validate_date(after)
+    before = _validate_date(before)
+    if after and before and after > before:
+        raise ValueError(
+            f"Invalid date range: after ({after}) is later than before ({before})."
+        )
+    return after, before
+
+
+def _page_in_range(
+    page: dict, after: Optional[str], before: Optional[str]
+) -> bool:
+    """Whether a `filings.files` page descriptor can hold filings in [after, before]."""
+    filing_from = page.get("filingFrom")
+    filing_to = page.get("filingTo")
+    if after and filing_to and filing_to < after:
+        return False
+    if before and filing_from and filing_from > before:
+        return False
+    return True
+
+
+def _company_tickers(company_json: dict) -> list[Ticker]:
+    return [
+        Ticker(symbol=ticker, exchange=exchange)
+        for ticker, exchange in zip(company_json["tickers"], company_json["exchanges"])
+    ]
+
+
+def _iter_submission_pages(
+    cik: str,
+    user_agent: str,
+    *,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+) -> Iterator[tuple[dict, dict]]:
+    """
+    Yields (company JSON, filings columns) for each submissions page, newest first.
+    Pages are fetched lazily, so callers that stop early skip the remaining requests.
+    """
+    submissions_uri = URL_SUBMISSIONS.format(
+        submission=SUBMISSION_FILE_FORMAT.format(cik=cik)
+    )
+    company_json = get_list_of_available_filings(submissions_uri, user_agent)
+    yield company_json, company_json["filings"]["recent"]
+
+    # Older filings (for companies with >1000 filings) are split into pages that
+    # each declare their date window, so pages outside the range are never downloaded.
+    for page in company_json["filings"]["files"]:
+        if not _page_in_range(page, after, before):
+            continue
+        submissions_uri = URL_SUBMISSIONS.format(submission=page["name"])
+        yield company_json, get_list_of_available_filings(submissions_uri, user_agent)
+
+
 def _get_metadatas(
     *,
     cik: str,
@@ -95,44 +220,37 @@ def _get_metadatas(
     ticker_or_cik: Optional[str] = None,
     accession_number: Optional[str] = None,
     form_type: Optional[str] = None,
+    form_limits: Optional[dict[str, int]] = None,
     include_amends: bool = False,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
 ) -> list[FilingMetadata]:
+    """
+    Scans the submissions pages once, newest first. With `form_limits`, filings
+    of every listed form type are collected in the same pass, each up to its own
+    limit, and the scan stops as soon as all limits are reached.
+    """
+    if form_type:
+        form_limits = {form_type: limit}
     assert (
-        ticker_or_cik and form_type
+        ticker_or_cik and form_limits
     ) or accession_number, (
         "Either ticker or CIK and form type or accession number must be provided"
     )
+    remaining = dict(form_limits) if form_limits else None
 
-    submissions_uri = URL_SUBMISSIONS.format(
-        submission=SUBMISSION_FILE_FORMAT.format(cik=cik)
-    )
-
-    additional_submissions = None
     found_metadatas: list[FilingMetadata] = []
     fetched_count = 0
     company_tickers = None
     company_cik = None
     company_name = None
-    while fetched_count < limit:
-        resp_json = get_list_of_available_filings(submissions_uri, user_agent)
-        # First API response is different from further API responses
-        if additional_submissions is None:
-            filings_json = resp_json["filings"]["recent"]
-            additional_submissions = deque(resp_json["filings"]["files"])
-            company_tickers = [
-                Ticker(symbol=ticker, exchange=exchange)
-                for ticker, exchange in zip(
-                    resp_json["tickers"], resp_json["exchanges"]
-                )
-            ]
-            company_name = resp_json["name"]
-            company_cik = str(resp_json["cik"]).zfill(CIK_LENGTH)
-        # On second page or more of API response (for companies with >1000 filings)
-        else:
-            filings_json = resp_json
-        assert company_tickers is not None
-        assert company_name is not None
-        assert company_cik is not None
+    for company_json, filings_json in _iter_submission_pages(
+        cik, user_agent, after=after, before=before
+    ):
+        if company_tickers is None:
+            company_tickers = _company_tickers(company_json)
+            company_name = company_json["name"]
+            company_cik = str(company_json["cik"]).zfill(CIK_LENGTH)
 
         accession_numbers = filings_json["accessionNumber"]
         primary_document_urls = filings_json["primaryDocument"]
@@ -162,9 +280,11 @@ def _get_metadatas(
             is_amend = this_form_type.endswith(AMENDS_SUFFIX)
             this_form_type = this_form_type[:-2] if is_amend else this_form_type
             if (
-                (form_type and form_type != this_form_type)
+                (remaining is not None and not remaining.get(this_form_type))
                 or (accession_number and accession_number != this_accession_number)
                 or (is_amend and not include_amends)
+                or (after and filing_date < after)
+                or (before and filing_date > before)
             ):
                 continue
 
@@ -183,19 +303,25 @@ def _get_metadatas(
             )
             found_metadatas.append(found_metadata)
             fetched_count += 1
+            if remaining is not None:
+                remaining[this_form_type] -= 1
             # We have reached the requested download limit, so break inner for loop
-            # early and allow the outer while loop to break.
+            # early and allow the outer loop to break.
             if fetched_count == limit:
                 break
 
-        if len(additional_submissions) == 0:
+        if fetched_count >= limit:
             break
 
-        next_page = additional_submissions.popleft()["name"]
-        submissions_uri = URL_SUBMISSIONS.format(submission=next_page)
-
-    requested_form = f" of type {form_type}" if form_type else ""
-    error_context = f"{accession_number or ticker_or_cik}{requested_form}"
+    requested_form = (
+        f" of type {', '.join(form_limits)}" if form_limits else ""
+    )
+    requested_range = (
+        f" filed between {after or 'any date'} and {before or 'today'}"
+        if after or before
+        else ""
+    )
+    error_context = f"{accession_number or ticker_or_cik}{requested_form}{requested_range}"
     if not found_metadatas:
         msg = f"Could not find any filings: {error_context}"
         raise ValueError(msg)
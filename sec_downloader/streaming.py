@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+from sec_edgar_downloader._constants import HOST_WWW_SEC
+
+from sec_downloader.throttle import sec_get
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_filing(
+    uri: str, user_agent: str, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Yields the document in chunks of at most `chunk_size` decoded bytes.
+    A gzip-encoded response is decompressed incrementally, so memory use
+    does not depend on the size of the filing.
+    """
+    with sec_get(uri, user_agent, HOST_WWW_SEC, stream=True) as resp:
+        yield from resp.iter_content(chunk_size=chunk_size)
+
+
+def download_filing_to_file(
+    uri: str,
+    user_agent: str,
+    path: Union[str, os.PathLike],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Path:
+    """
+    Streams the document to `path`. The data is written to a temporary file in
+    the same directory and renamed on success, so `path` is never left partial.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter_filing(uri, user_agent, chunk_size=chunk_size):
+                f.write(chunk)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return path
+
+
+@contextmanager
+def mapped_file(path: Union[str, os.PathLike]) -> Iterator[Union[mmap.mmap, bytes]]:
+    """
+    Read-only memory map of a stored filing, for parsers that accept bytes-like
+    input (e.g. `xml.etree.ElementTree.fromstring`). Pages are loaded by the OS
+    on demand and shared between processes reading the same file.
+    Any memoryview taken from the map must be released before the block exits.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Zero-length files cannot be mapped
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
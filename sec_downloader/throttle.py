@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from sec_edgar_downloader._constants import SEC_REQUESTS_PER_SEC_MAX, STANDARD_HEADERS
+
+from sec_downloader.hooks import RequestEvent, active_hooks
+
+# Statuses worth retrying for an idempotent GET; 429 and 503 also mean "slow down"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+THROTTLE_STATUSES = {429, 503}
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 30.0
+RETRY_AFTER_CAP_SECONDS = 600.0
+REQUEST_TIMEOUT_SECONDS = 60
+
+
+class AdaptiveRateController:
+    """
+    AIMD pacing for requests to one service, shared by every thread.
+
+    Requests are spaced 1/rate seconds apart. Each success adds `increase`
+    requests/second, up to `max_rate`. A throttling response (429/503) multiplies
+    the rate by `decrease`, at most once per second so a burst of in-flight
+    failures counts once, and pauses all requests for the Retry-After delay.
+    """
+
+    def __init__(
+        self,
+        max_rate: float = SEC_REQUESTS_PER_SEC_MAX,
+        *,
+        min_rate: float = 0.5,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+    ):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._rate = max_rate
+        self._next_slot = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+
+    @property
+    def current_rate(self) -> float:
+        """Requests per second currently allowed."""
+        return self._rate
+
+    def acquire(self):
+        """Blocks until the caller may send its next request."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1 / self._rate
+            self.requests += 1
+        if slot > now:
+            time.sleep(slot - now)
+
+    def on_success(self):
+        with self._lock:
+            self._rate = min(self.max_rate, self._rate + self.increase)
+
+    def on_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def on_throttle(self, pause: float):
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            if now - self._last_decrease >= 1.0:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+                self._last_decrease = now
+            self._next_slot = max(self._next_slot, now + pause)
+
+    def stats(self) -> dict:
+        return {
+            "current_rate": self._rate,
+            "max_rate": self.max_rate,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+        }
+
+
+# Shared by every request sec_downloader sends to www.sec.gov and data.sec.gov
+sec_rate_controller = AdaptiveRateController()
+_session = requests.Session()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, so concurrent retries spread out."""
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt))
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """
+    True for the failures sec_get retries (throttling, 5xx, connection errors and
+    timeouts): worth trying again later. Other HTTP errors (404, 403) are permanent.
+    """
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is None or exc.response.status_code in RETRY_STATUSES
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def _throttle_pause(resp: requests.Response, attempt: int) -> float:
+    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+    if retry_after is not None:
+        return min(retry_after, RETRY_AFTER_CAP_SECONDS) + random.uniform(0, 0.5)
+    return backoff_delay(attempt)
+
+
+def _response_size(resp: requests.Response, stream: bool) -> Optional[int]:
+    length = resp.headers.get("Content-Length")
+    if length and length.isdigit():
+        return int(length)
+    if resp.status_code == 304:
+        return 0
+    # Reading a streamed body here would defeat streaming
+    return None if stream else len(resp.content)
+
+
+def _notify_end(hooks, uri, start, attempts, stream, resp=None, error=None):
+    event = RequestEvent(
+        url=uri,
+        status=resp.status_code if resp is not None else None,
+        bytes=_response_size(resp, stream) if resp is not None else None,
+        latency=time.perf_counter() - start,
+        cache_hit=resp is not None and resp.status_code == 304,
+        attempts=attempts,
+        error=error,
+    )
+    for hook in hooks:
+        hook.on_request_end(event)
+
+
+def sec_get(
+    uri: str,
+    user_agent: str,
+    host: str,
+    *,
+    headers: Optional[dict] = None,
+    stream: bool = False,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    controller: AdaptiveRateController = sec_rate_controller,
+) -> requests.Response:
+    """
+    GET paced by `controller`. Throttling, 5xx responses and connection errors
+    are retried up to `max_retries` times. Other errors raise immediately.
+    A 304 is returned as is, for conditional requests.
+    Hooks active for the calling context (see `sec_downloader.hooks`) are
+    notified once per call, not per attempt.
+    """
+    request_headers = {
+        **STANDARD_HEADERS,
+        **(headers or {}),
+        "User-Agent": user_agent,
+        "Host": host,
+    }
+    hooks = active_hooks()
+    for hook in hooks:
+        hook.on_request_start(uri)
+    start = time.perf_counter()
+    attempts = 0
+    try:
+        for attempt in range(max_retries + 1):
+            attempts = attempt + 1
+            controller.acquire()
+            try:
+                resp = _session.get(
+                    uri,
+                    headers=request_headers,
+                    stream=stream,
+                    timeout=REQUEST_TIMEOUT_SECONDS,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == max_retries:
+                    raise
+                controller.on_retry()
+                time.sleep(backoff_delay(attempt))
+                continue
+
+            if resp.status_code in THROTTLE_STATUSES:
+                # Slows down and pauses every caller, also when this was the last attempt
+                controller.on_throttle(_throttle_pause(resp, attempt))
+            if resp.status_code in RETRY_STATUSES and attempt < max_retries:
+                resp.close()
+                controller.on_retry()
+                if resp.status_code not in THROTTLE_STATUSES:
+                    time.sleep(backoff_delay(attempt))
+                continue
+
+            if resp.status_code != 304:
+                try:
+                    resp.raise_for_status()
+                except requests.HTTPError:
+                    resp.close()
+                    raise
+            controller.on_success()
+            break
+    except BaseException as e:
+        if hooks:
+            _notify_end(hooks, uri, start, attempts, stream, getattr(e, "response", None), e)
+        raise
+
+    if hooks:
+        _notify_end(hooks, uri, start, attempts, stream, resp)
+    return resp
@@ -6,7 +6,8 @@ __all__ = ['Ticker', 'FilingMetadata', 'RequestedFilings', 'CompanyAndAccessionN
 # %% ../nbs/00_types.ipynb 1
 import re
 from dataclasses import dataclass
-from typing import Optional
+from datetime import date
+from typing import Optional, Union
 
 # %% ../nbs/00_types.ipynb 3
 @dataclass
@@ -32,8 +33,14 @@ class FilingMetadata:
 @dataclass
 class RequestedFilings:
     ticker_or_cik: str
-    form_type: str = "10-Q"
-    limit: int = 1
+    # One form type, or several to resolve in a single pass over the submissions
+    form_type: Union[str, tuple[str, ...]] = "10-Q"
+    limit: Optional[int] = 1
+    # Inclusive filing date range, as YYYY-MM-DD strings or dates
+    after: Optional[Union[str, date]] = None
+    before: Optional[Union[str, date]] = None
+    # Per-form overrides of `limit`, e.g. {"10-K": 1, "8-K": 5}
+    form_limits: Optional[dict[str, Optional[int]]] = None
 
     _REGEX_PATTERN = r"^(?:(\d+)/)?([^/]+)(?:/(.+))?$"
 
@@ -46,13 +53,41 @@ class RequestedFilings:
         limit = int(limit_str) if limit_str else cls.limit
         form_type = form_type if form_type else cls.form_type
         form_type = form_type.upper()
+        if "," in form_type:
+            form_type = tuple(f.strip() for f in form_type.split(",") if f.strip())
         return cls(
             limit=limit,
             ticker_or_cik=ticker_or_cik,
             form_type=form_type,
         )
 
-# %% ../nbs/00_types.ipynb 7
+    def __post_init__(self):
+        if not isinstance(self.form_type, str):
+            # Keep the caller's order (sets are sorted) and drop duplicates
+            forms = self.form_type
+            if isinstance(forms, (set, frozenset)):
+                forms = sorted(forms)
+            self.form_type = tuple(dict.fromkeys(forms))
+            if len(self.form_type) == 1:
+                self.form_type = self.form_type[0]
+        # Filing dates in EDGAR JSON are ISO strings, which compare correctly as text
+        if isinstance(self.after, date):
+            self.after = self.after.strftime("%Y-%m-%d")
+        if isinstance(self.before, date):
+            self.before = self.before.strftime("%Y-%m-%d")
+
+    @property
+    def form_types(self) -> tuple[str, ...]:
+        forms = (self.form_type,) if isinstance(self.form_type, str) else self.form_type
+        extra = tuple(f for f in (self.form_limits or {}) if f not in forms)
+        return forms + extra
+
+    def limits_by_form(self) -> dict[str, Optional[int]]:
+        """Limit for each requested form type; None means all available filings."""
+        overrides = self.form_limits or {}
+        return {f: overrides.get(f, self.limit) for f in self.form_types}
+
+# %% ../nbs/00_types.ipynb 9
 @dataclass
 class CompanyAndAccessionNumber:
     ticker_or_cik: str